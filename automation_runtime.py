@@ -7,10 +7,11 @@ backends.
 
 from __future__ import annotations
 
+import os
 import subprocess
 import tempfile
 from pathlib import Path
-from typing import Any, Tuple
+from typing import Any, Dict, Tuple
 
 import ctypes
 import sys
@@ -86,8 +87,16 @@ class PyAutoGuiRuntime:
             "FailSafeException",
             RuntimeError,
         )
+        # Newer PyAutoGUI/PyScreeze raise this instead of returning None on a miss.
+        not_found = getattr(self._pyautogui, "ImageNotFoundException", None)
+        self._image_not_found_types: tuple[type[BaseException], ...] = (
+            (not_found,) if isinstance(not_found, type) else ()
+        )
         # 禁用 DPI 缩放：始终使用 1.0，输入坐标直接对应物理像素
         self._dpi_scale = 1.0
+        # (image_path, grayscale) -> (mtime, decoded template) so polling does not
+        # re-read or re-convert the file.
+        self._needle_cache: Dict[Tuple[str, bool], Tuple[float, Any]] = {}
 
     @staticmethod
     def _import_pyautogui() -> Any:
@@ -247,6 +256,57 @@ class PyAutoGuiRuntime:
             color = screenshot.getpixel((scaled_x, scaled_y))
         return int(color[0]), int(color[1]), int(color[2])
 
+    def screen_size(self) -> tuple[int, int]:
+        width, height = self._pyautogui.size()
+        return self._unscale_value(int(width)), self._unscale_value(int(height))
+
+    def _load_needle(self, image_path: str, grayscale: bool) -> Any:
+        """Return the decoded template image, reloading it only when the file changes.
+
+        With OpenCV available (PyScreeze then matches through it) the template is
+        decoded straight into the array it matches on, already grayscale when
+        requested, so the conversion is not repeated on every poll. Otherwise a
+        Pillow image is cached. Falls back to the path itself (decoded by
+        PyAutoGUI per call) when the file cannot be inspected or decoded.
+        """
+
+        try:
+            mtime = os.stat(image_path).st_mtime
+        except OSError:
+            return image_path
+        key = (image_path, grayscale)
+        cached = self._needle_cache.get(key)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        needle = self._decode_needle(image_path, grayscale)
+        if needle is None:
+            return image_path
+        self._needle_cache[key] = (mtime, needle)
+        return needle
+
+    @staticmethod
+    def _decode_needle(image_path: str, grayscale: bool) -> Any:
+        try:
+            import cv2  # type: ignore
+        except ImportError:
+            cv2 = None
+        if cv2 is not None:
+            flag = cv2.IMREAD_GRAYSCALE if grayscale else cv2.IMREAD_COLOR
+            needle = cv2.imread(image_path, flag)
+            # imread returns None instead of raising (e.g. non-ASCII paths on
+            # Windows); Pillow can usually still open those.
+            if needle is not None:
+                return needle
+        try:
+            from PIL import Image  # type: ignore
+        except ImportError:  # pragma: no cover - Pillow ships with PyAutoGUI
+            return None
+        try:
+            with Image.open(image_path) as opened:
+                return opened.copy()
+        except OSError:
+            return None
+
     def locate_image(
         self,
         image_path: str,
@@ -265,15 +325,18 @@ class PyAutoGuiRuntime:
         locate_center = getattr(self._pyautogui, "locateCenterOnScreen", None)
         if locate_center is None:
             raise RuntimeError("PyAutoGUI locateCenterOnScreen is unavailable")
+        needle = self._load_needle(image_path, grayscale)
         kwargs: dict[str, Any] = {"grayscale": grayscale}
         if scaled_region is not None:
             kwargs["region"] = scaled_region
         try:
             location = locate_center(
-                image_path,
+                needle,
                 confidence=confidence,
                 **kwargs,
             )
+        except self._image_not_found_types:
+            return None
         except TypeError:
             retry_kwargs = kwargs.copy()
             co_varnames = getattr(getattr(locate_center, "__code__", None), "co_varnames", ())
@@ -287,7 +350,9 @@ class PyAutoGuiRuntime:
             if "grayscale" not in co_varnames:
                 retry_kwargs.pop("grayscale", None)
             try:
-                location = locate_center(image_path, **retry_kwargs)
+                location = locate_center(needle, **retry_kwargs)
+            except self._image_not_found_types:
+                return None
             except TypeError as exc:
                 raise RuntimeError(
                     "当前 PyAutoGUI 版本不支持提供的 locateCenterOnScreen 参数"
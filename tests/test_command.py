@@ -0,0 +1,49 @@
+import sys
+
+from automation_runtime import PyAutoGuiRuntime
+from workflow_core import ExecutionContext, create_node
+
+
+class FakePyAutoGui:
+    """Bare stand-in for pyautogui; command execution never touches it."""
+
+
+def test_command_output_is_kept_in_full():
+    script = (
+        "import sys; "
+        "[print(i) or print(-i, file=sys.stderr) for i in range(1, 20001)]; "
+        "print('x' * 1000000)"
+    )
+    node = create_node("command", "cmd")
+    node.config["command"] = f'"{sys.executable}" -c "{script}"'
+    node.validate_config()
+    context = ExecutionContext()
+
+    result = node.execute(context, PyAutoGuiRuntime(FakePyAutoGui()))
+
+    stdout_lines = result["stdout"].splitlines()
+    assert result["returncode"] == 0
+    assert stdout_lines[:2] == ["1", "2"]
+    assert len(stdout_lines) == 20001
+    assert stdout_lines[-1] == "x" * 1000000
+    assert result["stderr"].splitlines()[0] == "-1"
+    assert len(result["stderr"].splitlines()) == 20000
+    assert context.results["cmd"] == result
+
+
+def test_command_timeout_accepts_numeric_string():
+    node = create_node("command", "cmd")
+    node.config["command"] = "echo hi"
+    node.config["timeout"] = "5"
+    node.validate_config()
+
+    assert node.config["timeout"] == 5.0
+
+
+def test_command_timeout_defaults_when_missing():
+    node = create_node("command", "cmd")
+    node.config["command"] = "echo hi"
+    del node.config["timeout"]
+    node.validate_config()
+
+    assert node.config["timeout"] == 60.0
@@ -0,0 +1,47 @@
+from automation_runtime import PyAutoGuiRuntime
+from workflow_core import ExecutionContext, create_node
+
+
+class ImageNotFoundException(Exception):
+    pass
+
+
+class FakePyAutoGui:
+    """Stand-in for pyautogui whose image search raises on a miss, like current releases."""
+
+    ImageNotFoundException = ImageNotFoundException
+
+    def __init__(self, hits):
+        self.hits = hits
+        self.regions = []
+
+    def size(self):
+        return 1920, 1080
+
+    def locateCenterOnScreen(self, needle, confidence, grayscale, region=None):
+        self.regions.append(region)
+        location = self.hits.get(region)
+        if location is None:
+            raise ImageNotFoundException("not found")
+        return location
+
+
+def test_moved_target_falls_back_to_full_screen_search():
+    backend = FakePyAutoGui({None: (100, 100)})
+    runtime = PyAutoGuiRuntime(backend)
+    node = create_node("image_locate", "locate")
+    node.config["image_path"] = "target.png"
+    node.validate_config()
+
+    assert node.execute(ExecutionContext(), runtime) == {"x": 100, "y": 100}
+
+    # The target moves away from the previous hit: the hint area misses and
+    # the full-screen search finds it at the new position.
+    backend.hits = {None: (1500, 900)}
+    assert node.execute(ExecutionContext(), runtime) == {"x": 1500, "y": 900}
+    assert backend.regions == [None, (0, 0, 356, 356), None]
+
+
+def test_locate_image_returns_none_when_backend_raises_not_found():
+    runtime = PyAutoGuiRuntime(FakePyAutoGui({}))
+    assert runtime.locate_image("target.png", 0.9, None, False) is None
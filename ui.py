@@ -12,8 +12,8 @@ import math
 import sys
 import threading
 import time
-import uuid
 from collections import defaultdict
+from functools import lru_cache
 from json import JSONDecodeError
 from pathlib import Path
 from typing import Any, Callable, Dict, List, Optional, Tuple, Type, cast
@@ -23,7 +23,6 @@ if sys.platform == "win32":  # pragma: no cover - platform-specific hotkeys
 else:  # pragma: no cover - platform-specific hotkeys
 	wintypes = None  # type: ignore[assignment]
 
-from automation_runtime import PyAutoGuiRuntime, get_system_dpi_scale
 from PySide6.QtCore import (
 	QAbstractNativeEventFilter,
 	QCoreApplication,
@@ -40,9 +39,11 @@ from PySide6.QtCore import (
 	QSize,
 	QTimer,
 	QThread,
+	QElapsedTimer,
 )
 from PySide6.QtGui import (
 	QAction,
+	QBrush,
 	QColor,
 	QDrag,
 	QIcon,
@@ -51,6 +52,7 @@ from PySide6.QtGui import (
 	QPainter,
 	QPainterPath,
 	QPen,
+	QStaticText,
 	QTransform,
 	QFont,
 	QTextOption,
@@ -72,7 +74,6 @@ from PySide6.QtWidgets import (
 	QGraphicsPathItem,
 	QGraphicsRectItem,
 	QGraphicsScene,
-	QGraphicsTextItem,
 	QGraphicsProxyWidget,
 	QHBoxLayout,
 	QLabel,
@@ -85,6 +86,7 @@ from PySide6.QtWidgets import (
 	QSpinBox,
 	QSplitter,
 	QTextEdit,
+	QPlainTextEdit,
 	QToolButton,
 	QVBoxLayout,
 	QWidget,
@@ -182,6 +184,7 @@ from workflow_core import (
 	ExecutionError,
 	ForLoopNode,
 	IfConditionNode,
+	NODE_REGISTRY,
 	WhileLoopNode,
 	WorkflowExecutor,
 	WorkflowGraph,
@@ -455,6 +458,8 @@ class NodePalette(QListWidget):
 		"其他",
 	)
 
+	_entries_cache: Optional[Tuple[Tuple[str, ...], List[Tuple[str, List[Tuple[str, str]]]]]] = None
+
 	def __init__(self, parent: Optional[QWidget] = None) -> None:
 		super().__init__(parent)
 		self.setObjectName("nodePalette")
@@ -471,29 +476,47 @@ class NodePalette(QListWidget):
 		self._apply_palette_style()
 		self.populate()
 
+	@classmethod
+	def _palette_entries(cls) -> List[Tuple[str, List[Tuple[str, str]]]]:
+		"""Return ``(category, [(type_name, display_name), ...])`` in palette order.
+
+		The grouped and sorted layout is cached per class and only rebuilt
+		when the set of registered node types changes.
+		"""
+
+		registry_key = tuple(NODE_REGISTRY)
+		cached = cls._entries_cache
+		if cached is not None and cached[0] == registry_key:
+			return cached[1]
+		nodes_by_category: Dict[str, List[Tuple[str, str, str]]] = defaultdict(list)
+		for node_cls in iter_registry():
+			category = getattr(node_cls, "category", "其他") or "其他"
+			nodes_by_category[category].append(
+				(node_cls.display_name.lower(), node_cls.type_name, node_cls.display_name)
+			)
+		ordered_categories = [cat for cat in cls.CATEGORY_ORDER if cat in nodes_by_category]
+		remaining = sorted(cat for cat in nodes_by_category if cat not in cls.CATEGORY_ORDER)
+		entries: List[Tuple[str, List[Tuple[str, str]]]] = []
+		for category in ordered_categories + remaining:
+			nodes = sorted(nodes_by_category[category])
+			entries.append((category, [(type_name, display) for _key, type_name, display in nodes]))
+		cls._entries_cache = (registry_key, entries)
+		return entries
+
 	def populate(self) -> None:
 		self.clear()
 		self._category_headers.clear()
 		self._category_nodes.clear()
 		self._category_collapsed.clear()
-		nodes_by_category: Dict[str, List[WorkflowNodeModel]] = defaultdict(list)
-		for node in iter_registry():
-			category = getattr(node, "category", "其他") or "其他"
-			nodes_by_category[category].append(node)
-		if not nodes_by_category:
-			return
-		ordered_categories = [cat for cat in self.CATEGORY_ORDER if cat in nodes_by_category]
-		remaining = sorted(cat for cat in nodes_by_category if cat not in self.CATEGORY_ORDER)
-		for category in ordered_categories + remaining:
-			nodes = sorted(nodes_by_category[category], key=lambda item: item.display_name.lower())
+		for category, nodes in self._palette_entries():
 			if not nodes:
 				continue
 			header = self._add_category_header(category)
 			self._category_headers[category] = header
 			self._category_nodes[category] = []
-			for node in nodes:
-				item = QListWidgetItem(f"    {node.display_name}")
-				item.setData(Qt.ItemDataRole.UserRole, node.type_name)
+			for type_name, display_name in nodes:
+				item = QListWidgetItem(f"    {display_name}")
+				item.setData(Qt.ItemDataRole.UserRole, type_name)
 				item.setData(self.HEADER_ROLE, False)
 				item.setData(self.CATEGORY_NAME_ROLE, category)
 				self.addItem(item)
@@ -595,10 +618,14 @@ class WorkflowView(QGraphicsView):
 		)
 		self.setDragMode(QGraphicsView.DragMode.NoDrag)
 		self.setViewportUpdateMode(
-			QGraphicsView.ViewportUpdateMode.FullViewportUpdate
+			QGraphicsView.ViewportUpdateMode.SmartViewportUpdate
+		)
+		# The grid background is opaque and scene-aligned, so it can be cached between frames.
+		self.setCacheMode(QGraphicsView.CacheModeFlag.CacheBackground)
+		self.setOptimizationFlags(
+			QGraphicsView.OptimizationFlag.DontAdjustForAntialiasing
+			| QGraphicsView.OptimizationFlag.DontSavePainterState
 		)
-		self.setCacheMode(QGraphicsView.CacheModeFlag.CacheNone)
-		self.setOptimizationFlags(QGraphicsView.OptimizationFlag.DontAdjustForAntialiasing)
 		self.setTransformationAnchor(QGraphicsView.ViewportAnchor.AnchorUnderMouse)
 		self.setResizeAnchor(QGraphicsView.ViewportAnchor.AnchorUnderMouse)
 		self.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAsNeeded)
@@ -884,6 +911,13 @@ class NodeActionPanel(QWidget):
 class NodePort(QGraphicsEllipseItem):
 	"""Circular port used for incoming or outgoing connections."""
 
+	# Indexed by state: 0 = default, 1 = hovered, 2 = highlighted.
+	_BRUSHES: Tuple[QBrush, QBrush, QBrush] = (
+		QBrush(QColor(90, 90, 90)),
+		QBrush(QColor(130, 130, 130)),
+		QBrush(QColor(200, 200, 200)),
+	)
+
 	def __init__(
 		self,
 		parent: "WorkflowNodeItem",
@@ -894,10 +928,8 @@ class NodePort(QGraphicsEllipseItem):
 		super().__init__(-6, -6, 12, 12, parent)
 		self._is_hovered = False
 		self._is_highlighted = False
-		self._default_color = QColor(90, 90, 90)
-		self._hover_color = QColor(130, 130, 130)
-		self._highlight_color = QColor(200, 200, 200)
-		self.setBrush(self._default_color)
+		self._brush_idx = 0
+		self.setBrush(self._BRUSHES[0])
 		pen = QPen(QColor(45, 45, 45), 1.4)
 		pen.setCosmetic(True)
 		self.setPen(pen)
@@ -928,12 +960,11 @@ class NodePort(QGraphicsEllipseItem):
 		self._update_brush()
 
 	def _update_brush(self) -> None:
-		if self._is_highlighted:
-			self.setBrush(self._highlight_color)
-		elif self._is_hovered:
-			self.setBrush(self._hover_color)
-		else:
-			self.setBrush(self._default_color)
+		idx = 2 if self._is_highlighted else (1 if self._is_hovered else 0)
+		if idx == self._brush_idx:
+			return
+		self._brush_idx = idx
+		self.setBrush(self._BRUSHES[idx])
 
 	def mousePressEvent(self, event):  # noqa: D401
 		scene = cast(WorkflowScene, self.scene())
@@ -990,6 +1021,10 @@ class WorkflowNodeItem(QGraphicsRectItem):
 	MIN_HEIGHT = 80
 	HANDLE_SIZE = 16  # px in item coordinates
 	ACTION_PANEL_GAP = 16.0
+	TITLE_POS = QPointF(24.0, 18.0)
+	TITLE_COLOR = QColor(220, 220, 220)
+
+	_TITLE_FONT: Optional[QFont] = None
 
 	def __init__(self, node_model: WorkflowNodeModel) -> None:
 		super().__init__(0, 0, self.WIDTH, self.HEIGHT)
@@ -1000,6 +1035,9 @@ class WorkflowNodeItem(QGraphicsRectItem):
 		self.setFlag(
 			QGraphicsItem.GraphicsItemFlag.ItemSendsGeometryChanges
 		)
+		self.setFlag(QGraphicsItem.GraphicsItemFlag.ItemUsesExtendedStyleOption)
+		# Moving or panning reuses the cached pixmap; paint() only reruns after update().
+		self.setCacheMode(QGraphicsItem.CacheMode.DeviceCoordinateCache)
 		self.setBrush(Qt.BrushStyle.NoBrush)
 		self.setPen(Qt.PenStyle.NoPen)
 		self.setAcceptHoverEvents(True)
@@ -1021,14 +1059,9 @@ class WorkflowNodeItem(QGraphicsRectItem):
 		self._accent_color = QColor(90, 90, 90)
 		self._paint_margin = 8.0
 		self._create_action_panel()
-		self.title_item = QGraphicsTextItem(node_model.title, self)
-		title_font = QFont(self.title_item.font())
-		title_font.setPointSizeF(title_font.pointSizeF() + 1.5)
-		title_font.setBold(True)
-		self.title_item.setFont(title_font)
-		self.title_item.setDefaultTextColor(QColor(220, 220, 220))
-		self.title_item.setPos(20, 14)
-		self.title_item.setZValue(1)
+		self._title_font = self._shared_title_font()
+		self._title_text = QStaticText()
+		self._prepare_title(node_model.title)
 		self.input_ports: List[NodePort] = []
 		for idx, label in enumerate(node_model.input_ports()):
 			port = NodePort(self, "input", idx, label)
@@ -1145,9 +1178,27 @@ class WorkflowNodeItem(QGraphicsRectItem):
 	def is_pinned(self) -> bool:
 		return self._pinned
 
+	@classmethod
+	def _shared_title_font(cls) -> QFont:
+		if cls._TITLE_FONT is None:
+			title_font = QFont(QApplication.font())
+			title_font.setPointSizeF(title_font.pointSizeF() + 1.5)
+			title_font.setBold(True)
+			cls._TITLE_FONT = title_font
+		return cls._TITLE_FONT
+
+	def _prepare_title(self, title: str) -> None:
+		# QStaticText keeps the glyph layout, so paint() only blits the title.
+		self._title_text.setText(title)
+		self._title_text.prepare(QTransform(), self._title_font)
+
+	def title_text(self) -> str:
+		return self._title_text.text()
+
 	def set_title(self, title: str) -> None:
-		self.title_item.setPlainText(title)
+		self._prepare_title(title)
 		self.node_model.title = title
+		self.update()
 
 	def itemChange(self, change, value):  # noqa: D401
 		if change == QGraphicsItem.GraphicsItemChange.ItemPositionHasChanged:
@@ -1306,6 +1357,23 @@ class WorkflowNodeItem(QGraphicsRectItem):
 		return rect.adjusted(-margin, -top_margin, margin, margin)
 
 	def paint(self, painter: QPainter, option, widget=None):  # noqa: D401
+		# exposedRect is exact because ItemUsesExtendedStyleOption is set; bail
+		# out before any path building when nothing of the body needs repainting.
+		exposed = option.exposedRect
+		if exposed.isEmpty():
+			return
+		margin = self._paint_margin
+		if not exposed.intersects(self.rect().adjusted(-margin, -margin, margin, margin)):
+			return
+		# The view sets DontSavePainterState, so undo our pen/font/hint changes
+		# before the next item (edges, ports) is drawn with the same painter.
+		painter.save()
+		try:
+			self._paint_body(painter)
+		finally:
+			painter.restore()
+
+	def _paint_body(self, painter: QPainter) -> None:
 		painter.setRenderHint(QPainter.RenderHint.Antialiasing, True)
 		inner_rect = self.rect().adjusted(1, 1, -1, -1)
 		body_path = QPainterPath()
@@ -1346,12 +1414,19 @@ class WorkflowNodeItem(QGraphicsRectItem):
 			glow_pen.setCapStyle(Qt.PenCapStyle.RoundCap)
 			painter.setPen(glow_pen)
 			painter.drawPath(body_path)
-		painter.setPen(Qt.PenStyle.NoPen)
+		painter.setFont(self._title_font)
+		painter.setPen(self.TITLE_COLOR)
+		painter.drawStaticText(self.TITLE_POS, self._title_text)
 
 
 # -- Workflow scene --------------------------------------------------------
 
 
+@lru_cache(maxsize=128)
+def _node_id_base(node_type: str) -> str:
+	return node_type.split("_")[0]
+
+
 class WorkflowScene(QGraphicsScene):
 	"""Scene graph bridging the core workflow model with graphics items."""
 
@@ -1361,9 +1436,16 @@ class WorkflowScene(QGraphicsScene):
 
 	def __init__(self, parent: Optional[QObject] = None) -> None:
 		super().__init__(parent)
+		# Node counts stay small and items move constantly; a BSP index only adds upkeep.
+		self.setItemIndexMethod(QGraphicsScene.ItemIndexMethod.NoIndex)
 		self.graph = WorkflowGraph()
 		self.node_items: Dict[str, WorkflowNodeItem] = {}
-		self.connections: List[ConnectionItem] = []
+		# Insertion-ordered set of live connections; dict keys give O(1) removal.
+		self.connections: Dict[ConnectionItem, None] = {}
+		self._edges_by_node: Dict[str, List[ConnectionItem]] = defaultdict(list)
+		self._id_counter: Dict[str, int] = defaultdict(int)
+		# node_id -> (config items the tooltip was built from, tooltip text)
+		self._summary_cache: Dict[str, Tuple[Tuple[Tuple[str, object], ...], str]] = {}
 		self._pending_output: Optional[NodePort] = None
 		self._temp_connection: Optional[ConnectionItem] = None
 		self._temp_target_item: Optional[QGraphicsEllipseItem] = None
@@ -1374,6 +1456,11 @@ class WorkflowScene(QGraphicsScene):
 		self._default_scene_rect = QRectF(-8000.0, -6000.0, 16000.0, 12000.0)
 		self._view_scale = 1.0
 		self.setSceneRect(self._default_scene_rect)
+		# Bulk deletions schedule one scene-rect pass instead of one per node.
+		self._rect_recalc_timer = QTimer(self)
+		self._rect_recalc_timer.setSingleShot(True)
+		self._rect_recalc_timer.setInterval(0)
+		self._rect_recalc_timer.timeout.connect(self._recalculate_scene_rect)
 
 	def drawBackground(self, painter: QPainter, rect: QRectF | QRect) -> None:  # noqa: D401
 		grid_step = 28
@@ -1532,7 +1619,7 @@ class WorkflowScene(QGraphicsScene):
 		self.node_items[node_id] = item
 		item.on_view_scale_changed(self._view_scale)
 		self._promote_node(item)
-		summary = self._format_node_summary(node_model.config)
+		summary = self._node_summary(node_id, node_model.config)
 		item.setToolTip(summary)
 		self.ensure_scene_visible(item)
 		self.message_posted.emit(f"已添加节点: {node_model.title}")
@@ -1671,8 +1758,7 @@ class WorkflowScene(QGraphicsScene):
 					target_port=target_port.port_index,
 				)
 				self.removeItem(item)
-				if item in self.connections:
-					self.connections.remove(item)
+				self._unregister_connection(item)
 				self.message_posted.emit(f"重新连接 {source_node} -> {target_node}")
 				self._start_temp_connection(source_port, event.scenePos())
 				event.accept()
@@ -1697,7 +1783,7 @@ class WorkflowScene(QGraphicsScene):
 			self._clear_temp_line()
 			return
 		connection = ConnectionItem(source_port, target_port)
-		self.connections.append(connection)
+		self._register_connection(connection)
 		self.addItem(connection)
 		self.message_posted.emit(f"已连接 {source_node} -> {target_node}")
 		self._clear_temp_line()
@@ -1727,13 +1813,17 @@ class WorkflowScene(QGraphicsScene):
 			self._set_hover_port(None)
 			return
 		threshold = 24.0
+		px = pos.x()
+		py = pos.y()
 		best_port: Optional[NodePort] = None
-		best_distance = threshold
+		best_distance_sq = threshold * threshold
 		for candidate in self._candidate_target_ports(self._pending_output):
 			center = candidate.sceneBoundingRect().center()
-			distance = math.hypot(center.x() - pos.x(), center.y() - pos.y())
-			if distance <= best_distance:
-				best_distance = distance
+			dx = center.x() - px
+			dy = center.y() - py
+			distance_sq = dx * dx + dy * dy
+			if distance_sq <= best_distance_sq:
+				best_distance_sq = distance_sq
 				best_port = candidate
 		self._set_hover_port(best_port)
 
@@ -1744,14 +1834,18 @@ class WorkflowScene(QGraphicsScene):
 		threshold: float = 24.0,
 	) -> Optional[NodePort]:
 		best_port: Optional[NodePort] = None
-		best_distance = threshold
+		best_distance_sq = threshold * threshold
 		if source_port is None:
 			return None
+		px = pos.x()
+		py = pos.y()
 		for candidate in self._candidate_target_ports(source_port):
 			center = candidate.sceneBoundingRect().center()
-			distance = math.hypot(center.x() - pos.x(), center.y() - pos.y())
-			if distance <= best_distance:
-				best_distance = distance
+			dx = center.x() - px
+			dy = center.y() - py
+			distance_sq = dx * dx + dy * dy
+			if distance_sq <= best_distance_sq:
+				best_distance_sq = distance_sq
 				best_port = candidate
 		return best_port
 
@@ -1771,13 +1865,37 @@ class WorkflowScene(QGraphicsScene):
 			self._temp_connection.refresh_path()
 		super().mouseMoveEvent(event)
 
+	@staticmethod
+	def _connection_node_ids(connection: ConnectionItem) -> Tuple[str, str]:
+		source = cast(WorkflowNodeItem, connection.source.parentItem()).node_id
+		target = cast(WorkflowNodeItem, connection.target.parentItem()).node_id
+		return source, target
+
+	def _register_connection(self, connection: ConnectionItem) -> None:
+		self.connections[connection] = None
+		source, target = self._connection_node_ids(connection)
+		self._edges_by_node[source].append(connection)
+		self._edges_by_node[target].append(connection)
+
+	def _unregister_connection(self, connection: ConnectionItem) -> bool:
+		if self.connections.pop(connection, False) is False:
+			return False
+		for node_id in self._connection_node_ids(connection):
+			attached = self._edges_by_node.get(node_id)
+			if attached is None:
+				continue
+			if connection in attached:
+				attached.remove(connection)
+			if not attached:
+				del self._edges_by_node[node_id]
+		return True
+
 	def refresh_connections(self, node_item: WorkflowNodeItem) -> None:
-		for conn in list(self.connections):
-			if conn.source.parentItem() == node_item or conn.target.parentItem() == node_item:
-				conn.refresh_path()
+		for conn in self._edges_by_node.get(node_item.node_id, ()):
+			conn.refresh_path()
 
 	def delete_selection(self) -> None:
-		for item in list(self.selectedItems()):
+		for item in self.selectedItems():
 			if isinstance(item, ConnectionItem):
 				self._remove_connection(item)
 			elif isinstance(item, WorkflowNodeItem):
@@ -1787,27 +1905,22 @@ class WorkflowScene(QGraphicsScene):
 		item = self.node_items.get(node_id)
 		if not item:
 			return
-		for conn in list(self.connections):
-			if (
-				cast(WorkflowNodeItem, conn.source.parentItem()).node_id
-				== node_id
-			):
-				self._remove_connection(conn)
-			elif (
-				cast(WorkflowNodeItem, conn.target.parentItem()).node_id
-				== node_id
-			):
-				self._remove_connection(conn)
+		for conn in tuple(self._edges_by_node.get(node_id, ())):
+			self._remove_connection(conn)
 		self.removeItem(item)
 		del self.node_items[node_id]
+		self._summary_cache.pop(node_id, None)
 		self.graph.remove_node(node_id)
 		self.message_posted.emit(f"已删除节点 {node_id}")
-		self._recalculate_scene_rect()
+		self._rect_recalc_timer.start()
 		self.modified.emit()
 
 	def _remove_connection(self, connection: ConnectionItem) -> None:
-		source = cast(WorkflowNodeItem, connection.source.parentItem()).node_id
-		target = cast(WorkflowNodeItem, connection.target.parentItem()).node_id
+		# A connection may already be gone when its node was deleted earlier
+		# in the same selection sweep.
+		if not self._unregister_connection(connection):
+			return
+		source, target = self._connection_node_ids(connection)
 		self.graph.remove_edge(
 			source,
 			target,
@@ -1815,8 +1928,6 @@ class WorkflowScene(QGraphicsScene):
 			target_port=cast(NodePort, connection.target).port_index,
 		)
 		self.removeItem(connection)
-		if connection in self.connections:
-			self.connections.remove(connection)
 		self.message_posted.emit(f"已断开 {source} -> {target}")
 		self.modified.emit()
 
@@ -1826,19 +1937,34 @@ class WorkflowScene(QGraphicsScene):
 	def update_node_tooltip(self, node_id: str) -> None:
 		model = self.graph.nodes[node_id]
 		item = self.node_items[node_id]
-		item.setToolTip(self._format_node_summary(model.config))
-		item.set_title(model.title)
+		item.setToolTip(self._node_summary(node_id, model.config))
+		if item.title_text() != model.title:
+			# set_title() invalidates only this item's cache.
+			item.set_title(model.title)
 		self._promote_node(item)
 		self.modified.emit()
 
 	def _generate_node_id(self, node_type: str) -> str:
-		base = node_type.split("_")[0]
-		return f"{base}_{uuid.uuid4().hex[:6]}"
+		base = _node_id_base(node_type)
+		# Imported workflows may already use counter-style ids, so skip taken ones.
+		while True:
+			self._id_counter[base] += 1
+			node_id = f"{base}_{self._id_counter[base]}"
+			if node_id not in self.graph.nodes:
+				return node_id
+
+	def _node_summary(self, node_id: str, config: Dict[str, object]) -> str:
+		signature = tuple(config.items())
+		cached = self._summary_cache.get(node_id)
+		if cached is not None and cached[0] == signature:
+			return cached[1]
+		summary = self._format_node_summary(config)
+		self._summary_cache[node_id] = (signature, summary)
+		return summary
 
 	@staticmethod
 	def _format_node_summary(config: Dict[str, object]) -> str:
-		parts = [f"{key}: {value}" for key, value in config.items()]
-		return "\n".join(parts)
+		return "\n".join(f"{key}: {value}" for key, value in config.items())
 
 	def clear_workflow(self, notify: bool = True, mark_modified: bool = True) -> None:
 		self._clear_temp_line()
@@ -1846,6 +1972,8 @@ class WorkflowScene(QGraphicsScene):
 		self.graph = WorkflowGraph()
 		self.node_items.clear()
 		self.connections.clear()
+		self._edges_by_node.clear()
+		self._summary_cache.clear()
 		self._pending_output = None
 		self._temp_connection = None
 		self._temp_target_item = None
@@ -1942,7 +2070,7 @@ class WorkflowScene(QGraphicsScene):
 				pinned = bool(pinned_value)
 			if pinned:
 				item.set_pinned(True, notify=False)
-			summary = self._format_node_summary(node_model.config)
+			summary = self._node_summary(node_id, node_model.config)
 			item.setToolTip(summary)
 		for entry in edges_data:
 			source = cast(str, entry.get("source"))
@@ -1973,6 +2101,7 @@ class WorkflowScene(QGraphicsScene):
 					target,
 					source_port=port_index,
 					target_port=target_port_index,
+					allow_cycle=True,
 				)
 			except ValueError as exc:
 				self.message_posted.emit(f"连接 {source} -> {target} 失败: {exc}")
@@ -2004,9 +2133,12 @@ class WorkflowScene(QGraphicsScene):
 				)
 				continue
 			connection = ConnectionItem(source_port_item, target_port_item)
-			self.connections.append(connection)
+			self._register_connection(connection)
 			self.addItem(connection)
 		self._recalculate_scene_rect()
+		# Saved workflows keep their edges as-is; a cycle is reported here and blocks the run.
+		if self.graph.has_cycle():
+			self.message_posted.emit("工作流存在循环连接，运行前请改用循环节点")
 		if mark_modified:
 			self.modified.emit()
 
@@ -2363,6 +2495,51 @@ class WindowPicker(QWidget):
 					pass
 
 
+def _choice_value(widget: Any) -> object:
+	data = widget.currentData()
+	if data is None:
+		mapping = widget.property("_workflow_choice_map")
+		text_value = widget.currentText()
+		if isinstance(mapping, dict) and text_value in mapping:
+			data = mapping[text_value]
+		else:
+			data = text_value
+	return data
+
+
+# Widget class per schema field type; resolved once since the Fluent aliases fall back to Qt.
+_WIDGET_FACTORIES: Dict[str, Type[QWidget]] = {
+	"bool": QCheckBox,
+	"int": FluentSpinBox,
+	"float": FluentDoubleSpinBox,
+	"choices": FluentComboBox,
+	"multiline": FluentTextEdit,
+	"str": FluentLineEdit,
+}
+
+# Value readers for ConfigDialog.values(), keyed by the exact widget class created above.
+_VALUE_GETTERS: Dict[type, Callable[[Any], object]] = {
+	QCheckBox: lambda widget: widget.isChecked(),
+	PathPicker: lambda widget: widget.value(),
+	WindowPicker: lambda widget: widget.value(),
+	FluentSpinBox: lambda widget: widget.value(),
+	FluentDoubleSpinBox: lambda widget: widget.value(),
+	FluentComboBox: _choice_value,
+	FluentTextEdit: lambda widget: widget.toPlainText(),
+	FluentLineEdit: lambda widget: widget.text(),
+}
+
+
+def _value_getter(widget: QWidget) -> Optional[Callable[[Any], object]]:
+	getter = _VALUE_GETTERS.get(type(widget))
+	if getter is None:
+		for base in type(widget).__mro__[1:]:
+			getter = _VALUE_GETTERS.get(base)
+			if getter is not None:
+				break
+	return getter
+
+
 class ConfigDialog(ConfigDialogBase):
 	"""Generic configuration dialog built from a node schema."""
 
@@ -2386,7 +2563,7 @@ class ConfigDialog(ConfigDialogBase):
 		# Store references to widgets that should be hidden when fullscreen is checked
 		self._coordinate_widgets: Dict[str, Tuple[QWidget, QWidget]] = {}
 		
-		for field in node_model.config_schema():
+		for field in node_model.schema():
 			widget = self._create_widget(field, node_model.config)
 			label_text = field.get("label", field["key"])
 			label_widget: QWidget
@@ -2500,12 +2677,12 @@ class ConfigDialog(ConfigDialogBase):
 				placeholder=cast(str, field.get("placeholder", "")),
 			)
 			return picker
+		widget_cls = _WIDGET_FACTORIES.get(ftype, FluentLineEdit)
 		if ftype == "bool":
-			widget = QCheckBox(self)
+			widget = widget_cls(self)
 			widget.setChecked(bool(value))
 			return widget
 		if ftype == "int":
-			widget_cls = FluentSpinBox if HAVE_FLUENT_WIDGETS else QSpinBox
 			widget = widget_cls(self)
 			widget.setRange(
 				int(cast(int, field.get("min", 0))),
@@ -2514,7 +2691,6 @@ class ConfigDialog(ConfigDialogBase):
 			widget.setValue(int(value) if value is not None else 0)
 			return widget
 		if ftype == "float":
-			widget_cls = FluentDoubleSpinBox if HAVE_FLUENT_WIDGETS else QDoubleSpinBox
 			widget = widget_cls(self)
 			if hasattr(widget, "setDecimals"):
 				widget.setDecimals(3)
@@ -2526,7 +2702,6 @@ class ConfigDialog(ConfigDialogBase):
 			widget.setValue(float(value) if value is not None else 0.0)
 			return widget
 		if ftype == "choices":
-			widget_cls = FluentComboBox if HAVE_FLUENT_WIDGETS else QComboBox
 			widget = widget_cls(self)
 			choices = cast(List[Tuple[str, str]], field.get("choices", []))
 			label_map = {label: ident for ident, label in choices}
@@ -2544,7 +2719,6 @@ class ConfigDialog(ConfigDialogBase):
 				widget.setCurrentIndex(index)
 			return widget
 		if ftype == "multiline":
-			widget_cls = FluentTextEdit if HAVE_FLUENT_WIDGETS else QTextEdit
 			widget = widget_cls(self)
 			widget.setPlainText(str(value or ""))
 			widget.setMinimumHeight(200 if field.get("key") == "code" else 80)
@@ -2554,7 +2728,6 @@ class ConfigDialog(ConfigDialogBase):
 				pass
 			widget.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAsNeeded)
 			return widget
-		widget_cls = FluentLineEdit if HAVE_FLUENT_WIDGETS else QLineEdit
 		widget = widget_cls(self)
 		widget.setText(str(value or ""))
 		return widget
@@ -2562,36 +2735,23 @@ class ConfigDialog(ConfigDialogBase):
 	def values(self) -> Dict[str, object]:
 		result: Dict[str, object] = {}
 		for key, widget in self.widgets.items():
-			if isinstance(widget, QCheckBox):
-				result[key] = widget.isChecked()
-			elif isinstance(widget, PathPicker):
-				result[key] = widget.value()
-			elif isinstance(widget, (FluentSpinBox, QSpinBox)):
-				result[key] = widget.value()
-			elif isinstance(widget, (FluentDoubleSpinBox, QDoubleSpinBox)):
-				result[key] = widget.value()
-			elif isinstance(widget, (FluentComboBox, QComboBox)):
-				data = widget.currentData()
-				if data is None:
-					mapping = widget.property("_workflow_choice_map")
-					text_value = widget.currentText()
-					if isinstance(mapping, dict) and text_value in mapping:
-						data = mapping[text_value]
-					else:
-						data = text_value
-				result[key] = data
-			elif isinstance(widget, WindowPicker):
-				result[key] = widget.value()
-			elif isinstance(widget, (FluentTextEdit, QTextEdit)):
-				result[key] = widget.toPlainText()
-			elif isinstance(widget, (FluentLineEdit, QLineEdit)):
-				result[key] = widget.text()
+			getter = _value_getter(widget)
+			if getter is not None:
+				result[key] = getter(widget)
 		return result
 
 
 # -- Execution runner ------------------------------------------------------
 
 
+def _default_runtime_factory() -> AutomationRuntime:
+	"""Build the pyautogui runtime, deferring its import until a run starts."""
+
+	from automation_runtime import PyAutoGuiRuntime
+
+	return PyAutoGuiRuntime(dpi_scale=1.0)  # 禁用 DPI 缩放
+
+
 class WorkflowRunner(QObject):
 	"""Execute workflows on a worker thread with cancellation support."""
 
@@ -2606,7 +2766,7 @@ class WorkflowRunner(QObject):
 	) -> None:
 		super().__init__(parent)
 		self._graph_supplier = graph_supplier
-		self._runtime_factory = runtime_factory or PyAutoGuiRuntime
+		self._runtime_factory = runtime_factory or _default_runtime_factory
 		self._running = False
 		self._stop_event: Optional[threading.Event] = None
 		self._threads: List[QThread] = []
@@ -2619,15 +2779,16 @@ class WorkflowRunner(QObject):
 		if self._running:
 			return
 		self._stop_event = threading.Event()
+		# Snapshot the graph on the GUI thread so edits made during the run cannot race the worker.
 		worker = _WorkflowRunnerWorker(
-			self._graph_supplier,
+			self._graph_supplier(),
 			self._runtime_factory,
 			self._stop_event,
 		)
 		thread = QThread()
 		worker.moveToThread(thread)
 		thread.started.connect(worker.run)
-		worker.finished.connect(self._handle_worker_finished)
+		worker.finished.connect(self._handle_worker_finished, Qt.ConnectionType.QueuedConnection)
 		worker.finished.connect(thread.quit)
 		worker.finished.connect(worker.deleteLater)
 		thread.finished.connect(self._on_thread_finished)
@@ -2669,21 +2830,20 @@ class _WorkflowRunnerWorker(QObject):
 
 	def __init__(
 		self,
-		graph_supplier: Callable[[], WorkflowGraph],
+		graph: WorkflowGraph,
 		runtime_factory: Callable[[], AutomationRuntime],
 		stop_event: threading.Event,
 		parent: Optional[QObject] = None,
 	) -> None:
 		super().__init__(parent)
-		self._graph_supplier = graph_supplier
+		self._graph = graph
 		self._runtime_factory = runtime_factory
 		self._stop_event = stop_event
 
 	def run(self) -> None:
 		try:
-			graph_copy = self._graph_supplier()
 			executor = WorkflowExecutor(self._runtime_factory())
-			executor.run(graph_copy, should_stop=self._stop_event.is_set)
+			executor.run(self._graph, stop_event=self._stop_event)
 		except ExecutionError as exc:
 			if self._stop_event.is_set():
 				self.finished.emit(False, "执行已取消")
@@ -2925,6 +3085,10 @@ class WorkflowInterface(QWidget):
 	run_state_changed = Signal(bool)
 	file_context_changed = Signal(str, bool)
 
+	LOG_FLUSH_INTERVAL_MS = 80
+	INFO_BAR_MIN_INTERVAL_MS = 500
+	LOG_MAX_LINES = 2000
+
 	def __init__(
 		self,
 		settings: SettingsManager,
@@ -2942,6 +3106,19 @@ class WorkflowInterface(QWidget):
 		self._workflow_filter = "JSON Files (*.json);;All Files (*.*)"
 		self._window_base_title = "Command Flow Studio"
 		self._is_running = False
+		self._pending_log: List[Tuple[str, str]] = []
+		self._log_stamp_second = -1
+		self._log_stamp = ""
+		self._log_flush_timer = QTimer(self)
+		self._log_flush_timer.setSingleShot(True)
+		self._log_flush_timer.setInterval(self.LOG_FLUSH_INTERVAL_MS)
+		self._log_flush_timer.timeout.connect(self._flush_log)
+		self._active_info_bar: Optional[QWidget] = None
+		self._info_bar_clock = QElapsedTimer()
+		self._pending_info_message: Optional[str] = None
+		self._info_bar_timer = QTimer(self)
+		self._info_bar_timer.setSingleShot(True)
+		self._info_bar_timer.timeout.connect(self._replace_info_bar)
 
 		self.scene = WorkflowScene(self)
 		self.scene.message_posted.connect(self.append_log)
@@ -2956,8 +3133,11 @@ class WorkflowInterface(QWidget):
 		self.view.zoomChanged.connect(lambda value: self.show_status(f"缩放 {value * 100:.0f}%"))
 		self.scene.set_view_scale(self.view.transform().m11())
 
-		self.log_widget = QTextEdit(self)
+		# Plain-text document without undo history, capped so long runs keep appends cheap.
+		self.log_widget = QPlainTextEdit(self)
 		self.log_widget.setReadOnly(True)
+		self.log_widget.setUndoRedoEnabled(False)
+		self.log_widget.setMaximumBlockCount(self.LOG_MAX_LINES)
 		self.log_widget.setObjectName("workflowLog")
 		log_font = QFont(self.log_widget.font())
 		log_font.setFamily("Consolas")
@@ -3079,7 +3259,7 @@ class WorkflowInterface(QWidget):
 
 		self.runner = WorkflowRunner(
 			graph_supplier=lambda: self.scene.graph.copy(),
-			runtime_factory=lambda: PyAutoGuiRuntime(dpi_scale=1.0),  # 禁用 DPI 缩放
+			runtime_factory=_default_runtime_factory,
 			parent=self,
 		)
 		self.runner.started.connect(self._on_runner_started)
@@ -3125,6 +3305,7 @@ class WorkflowInterface(QWidget):
 		self.show_status("视图已适配当前工作流", 2000)
 
 	def clear_log(self) -> None:
+		self._pending_log.clear()
 		self.log_widget.clear()
 		self.show_status("日志已清空", 2000)
 
@@ -3299,22 +3480,72 @@ class WorkflowInterface(QWidget):
 		return True
 
 	def append_log(self, message: str) -> None:
-		timestamp = time.strftime("%H:%M:%S")
-		self.log_widget.append(f"[{timestamp}] {message}")
-		self.show_status(message)
+		# Bursts of messages (e.g. during a run) are coalesced into one widget update.
+		self._pending_log.append((self._log_timestamp(), message))
+		if not self._log_flush_timer.isActive():
+			self._log_flush_timer.start()
+
+	def _log_timestamp(self) -> str:
+		# Messages arriving within the same second share one formatted stamp.
+		now = time.time()
+		second = int(now)
+		if second != self._log_stamp_second:
+			self._log_stamp_second = second
+			self._log_stamp = time.strftime("%H:%M:%S", time.localtime(now))
+		return self._log_stamp
+
+	def _flush_log(self) -> None:
+		if not self._pending_log:
+			return
+		pending, self._pending_log = self._pending_log, []
+		self.log_widget.appendPlainText("\n".join(f"[{timestamp}] {message}" for timestamp, message in pending))
+		latest = pending[-1][1]
+		self.show_status(latest)
 		if INFOBAR_AVAILABLE:
-			# Mirror log output in a Fluent info bar for quick visual feedback.
-			info_bar_cls = cast(Any, InfoBar)
-			position = cast(Any, InfoBarPosition.TOP_RIGHT)
-			info_bar_cls.success(
-				title="提示",
-				content=message,
-				orient=Qt.Orientation.Horizontal,
-				isClosable=True,
-				position=position,
-				duration=2000,
-				parent=self,
-			)
+			self._show_info_bar(latest)
+
+	def _show_info_bar(self, message: str) -> None:
+		# Keep at most one Fluent info bar on screen and replace it at most every
+		# INFO_BAR_MIN_INTERVAL_MS; faster messages fold into the next replacement.
+		self._pending_info_message = message
+		if self._info_bar_timer.isActive():
+			return
+		if self._info_bar_clock.isValid():
+			remaining = self.INFO_BAR_MIN_INTERVAL_MS - self._info_bar_clock.elapsed()
+			if remaining > 0:
+				self._info_bar_timer.start(int(remaining))
+				return
+		self._replace_info_bar()
+
+	def _replace_info_bar(self) -> None:
+		message = self._pending_info_message
+		self._pending_info_message = None
+		if message is None:
+			return
+		old_bar = self._active_info_bar
+		if old_bar is not None:
+			self._active_info_bar = None
+			old_bar.destroyed.disconnect(self._on_info_bar_destroyed)
+			old_bar.close()
+		info_bar_cls = cast(Any, InfoBar)
+		position = cast(Any, InfoBarPosition.TOP_RIGHT)
+		bar = info_bar_cls.success(
+			title="提示",
+			content=message,
+			orient=Qt.Orientation.Horizontal,
+			isClosable=True,
+			position=position,
+			duration=2000,
+			parent=self,
+		)
+		self._info_bar_clock.start()
+		if bar is None:
+			return
+		self._active_info_bar = bar
+		bar.destroyed.connect(self._on_info_bar_destroyed)
+
+	def _on_info_bar_destroyed(self, *_args) -> None:
+		self._active_info_bar = None
 
 	def configure_node(self, node_id: str) -> None:
 		node_model = self.scene.graph.nodes.get(node_id)
@@ -3349,10 +3580,8 @@ class WorkflowInterface(QWidget):
 			if self._unsaved_changes:
 				self.show_status("运行已取消：更改未保存", 4000)
 				return
-		try:
-			self.scene.graph.topological_order()
-		except ExecutionError as exc:
-			show_warning(self, "拓扑错误", str(exc))
+		if self.scene.graph.has_cycle():
+			show_warning(self, "拓扑错误", "工作流存在循环连接")
 			return
 		self.runner.run()
 
@@ -3454,7 +3683,7 @@ class WorkflowInterface(QWidget):
 			border: none;
 			border-radius: 12px;
 		}
-		QTextEdit#workflowLog {
+		QPlainTextEdit#workflowLog {
 			background: transparent;
 			border: 1px solid rgba(255, 255, 255, 25);
 			border-radius: 10px;
@@ -2,10 +2,12 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 import ctypes
 from ctypes import wintypes
 import sys
+import threading
+import time
 
 __all__ = [
     "list_windows",
@@ -30,48 +32,109 @@ if sys.platform != "win32":  # pragma: no cover - non-Windows fallback
 
 else:  # pragma: no cover - Windows-only implementation
 
-    user32 = ctypes.windll.user32
-    kernel32 = ctypes.windll.kernel32
+    # Private library handles so the prototypes below do not leak into other
+    # modules that go through ``ctypes.windll``.
+    user32 = ctypes.WinDLL("user32")
+    kernel32 = ctypes.WinDLL("kernel32")
     EnumWindowsProc = ctypes.WINFUNCTYPE(ctypes.c_bool, wintypes.HWND, wintypes.LPARAM)
     SW_RESTORE = 9
 
-    def _get_window_text(hwnd: int) -> str:
-        length = user32.GetWindowTextLengthW(hwnd)
-        if length == 0:
-            return ""
-        buffer = ctypes.create_unicode_buffer(length + 1)
-        user32.GetWindowTextW(hwnd, buffer, length + 1)
-        return buffer.value.strip()
-
-    def _get_class_name(hwnd: int) -> str:
-        buffer = ctypes.create_unicode_buffer(256)
-        user32.GetClassNameW(hwnd, buffer, 256)
-        return buffer.value
-
-    def _should_include(hwnd: int) -> bool:
-        if not user32.IsWindowVisible(hwnd):
-            return False
-        title = _get_window_text(hwnd)
-        if not title:
-            return False
-        class_name = _get_class_name(hwnd)
-        if class_name in {"Shell_TrayWnd", "Progman"}:
-            return False
-        return True
+    def _declare(func: Any, argtypes: List[Any], restype: Any) -> None:
+        func.argtypes = argtypes
+        func.restype = restype
+
+    _declare(user32.EnumWindows, [EnumWindowsProc, wintypes.LPARAM], wintypes.BOOL)
+    _declare(user32.GetWindowTextW, [wintypes.HWND, wintypes.LPWSTR, ctypes.c_int], ctypes.c_int)
+    _declare(user32.GetClassNameW, [wintypes.HWND, wintypes.LPWSTR, ctypes.c_int], ctypes.c_int)
+    _declare(user32.IsWindowVisible, [wintypes.HWND], wintypes.BOOL)
+    _declare(user32.IsIconic, [wintypes.HWND], wintypes.BOOL)
+    _declare(user32.IsWindow, [wintypes.HWND], wintypes.BOOL)
+    _declare(user32.ShowWindow, [wintypes.HWND, ctypes.c_int], wintypes.BOOL)
+    _declare(user32.GetForegroundWindow, [], wintypes.HWND)
+    _declare(user32.GetWindowThreadProcessId, [wintypes.HWND, wintypes.LPDWORD], wintypes.DWORD)
+    _declare(user32.AttachThreadInput, [wintypes.DWORD, wintypes.DWORD, wintypes.BOOL], wintypes.BOOL)
+    _declare(user32.BringWindowToTop, [wintypes.HWND], wintypes.BOOL)
+    _declare(user32.SetForegroundWindow, [wintypes.HWND], wintypes.BOOL)
+    _declare(kernel32.GetCurrentThreadId, [], wintypes.DWORD)
+    # Undocumented export; resolved once so activate_window does not probe for it.
+    _switch_to_this_window = getattr(user32, "SwitchToThisWindow", None)
+    if _switch_to_this_window is not None:
+        _declare(_switch_to_this_window, [wintypes.HWND, wintypes.BOOL], None)
+    # Shell surfaces (taskbar, desktop, wallpaper workers, legacy Start button) are never targets.
+    _EXCLUDED_CLASSES = frozenset({"Shell_TrayWnd", "Progman", "WorkerW", "Button"})
+
+    # Snapshots younger than this are reused instead of walking EnumWindows again.
+    _CACHE_TTL = 0.25
+    _cache: Dict[str, Any] = {"ts": 0.0, "data": []}
+    _cache_lock = threading.Lock()
+
+    # Successful title lookups, reused while fresh and the window still exists.
+    _TITLE_CACHE_TTL = 1.0
+    _TITLE_CACHE_MAX = 64
+    _title_cache: Dict[str, Tuple[float, int]] = {}
+
+    _TEXT_BUFFER_SIZE = 512
+    _CLASS_BUFFER_SIZE = 256
+    _buffers = threading.local()
+
+    def _thread_buffers() -> Any:
+        """Return this thread's reusable ``(title, class name)`` buffers."""
+
+        pair = getattr(_buffers, "pair", None)
+        if pair is None:
+            pair = (
+                ctypes.create_unicode_buffer(_TEXT_BUFFER_SIZE),
+                ctypes.create_unicode_buffer(_CLASS_BUFFER_SIZE),
+            )
+            _buffers.pair = pair
+        return pair
+
+    def _invalidate_cache() -> None:
+        with _cache_lock:
+            _cache["ts"] = 0.0
 
     def list_windows() -> List[Dict[str, Any]]:
+        with _cache_lock:
+            if time.monotonic() - _cache["ts"] < _CACHE_TTL:
+                return list(_cache["data"])
+        windows = _enumerate_windows()
+        with _cache_lock:
+            _cache["data"] = windows
+            _cache["ts"] = time.monotonic()
+        return list(windows)
+
+    def _enumerate_windows() -> List[Dict[str, Any]]:
         windows: List[Dict[str, Any]] = []
+        is_visible = user32.IsWindowVisible
+        get_text = user32.GetWindowTextW
+        get_class_name = user32.GetClassNameW
+        is_iconic = user32.IsIconic
+        excluded = _EXCLUDED_CLASSES
+        text_buffer, class_buffer = _thread_buffers()
+        text_size = _TEXT_BUFFER_SIZE
+        class_size = _CLASS_BUFFER_SIZE
 
         def _callback(hwnd, _lparam):
-            if _should_include(hwnd):
-                windows.append(
-                    {
-                        "hwnd": int(hwnd),
-                        "title": _get_window_text(hwnd),
-                        "class_name": _get_class_name(hwnd),
-                        "is_minimized": bool(user32.IsIconic(hwnd)),
-                    }
-                )
+            # Cheapest checks first: most top-level HWNDs are hidden or untitled.
+            if not is_visible(hwnd):
+                return True
+            if get_text(hwnd, text_buffer, text_size) == 0:
+                return True
+            title = text_buffer.value.strip()
+            if not title:
+                return True
+            get_class_name(hwnd, class_buffer, class_size)
+            class_name = class_buffer.value
+            if class_name in excluded:
+                return True
+            windows.append(
+                {
+                    "hwnd": int(hwnd),
+                    "title": title,
+                    "class_name": class_name,
+                    "is_minimized": bool(is_iconic(hwnd)),
+                }
+            )
             return True
 
         user32.EnumWindows(EnumWindowsProc(_callback), 0)
@@ -93,42 +156,93 @@ else:  # pragma: no cover - Windows-only implementation
             return False
         _restore_window(hwnd)
         foreground = user32.GetForegroundWindow()
+        if foreground and int(foreground) == int(hwnd):
+            _invalidate_cache()
+            return True
         current_thread = kernel32.GetCurrentThreadId()
         target_thread = user32.GetWindowThreadProcessId(hwnd, None)
         foreground_thread = user32.GetWindowThreadProcessId(foreground, None) if foreground else 0
+        if foreground_thread in (current_thread, target_thread):
+            foreground_thread = 0
 
+        success = False
         _attach_threads(current_thread, target_thread, True)
         if foreground_thread:
             _attach_threads(current_thread, foreground_thread, True)
-
-        user32.BringWindowToTop(hwnd)
-        success = bool(user32.SetForegroundWindow(hwnd))
-        if not success:
-            switch = getattr(user32, "SwitchToThisWindow", None)
-            if switch is not None:
+        try:
+            user32.BringWindowToTop(hwnd)
+            success = bool(user32.SetForegroundWindow(hwnd))
+            if not success and _switch_to_this_window is not None:
                 try:
-                    switch(hwnd, True)
+                    _switch_to_this_window(hwnd, True)
                     success = True
                 except Exception:  # pragma: no cover - defensive
                     success = False
+        finally:
+            _attach_threads(current_thread, target_thread, False)
+            if foreground_thread:
+                _attach_threads(current_thread, foreground_thread, False)
+
+        if success:
+            # Restoring/raising changes the minimized state reported by the snapshot.
+            _invalidate_cache()
+        return success
 
-        _attach_threads(current_thread, target_thread, False)
-        if foreground_thread:
-            _attach_threads(current_thread, foreground_thread, False)
+    def _find_window_impl(normalized: str) -> Optional[int]:
+        exact: List[int] = []
+        partial: List[int] = []
+        is_visible = user32.IsWindowVisible
+        get_text = user32.GetWindowTextW
+        get_class_name = user32.GetClassNameW
+        excluded = _EXCLUDED_CLASSES
+        text_buffer, class_buffer = _thread_buffers()
+        text_size = _TEXT_BUFFER_SIZE
+        class_size = _CLASS_BUFFER_SIZE
 
-        return success
+        def _callback(hwnd, _lparam):
+            if not is_visible(hwnd):
+                return True
+            if get_text(hwnd, text_buffer, text_size) == 0:
+                return True
+            folded = text_buffer.value.strip().casefold()
+            if not folded:
+                return True
+            is_exact = folded == normalized
+            # Only the first substring match is kept, so later ones need no class lookup.
+            if not is_exact and (partial or normalized not in folded):
+                return True
+            get_class_name(hwnd, class_buffer, class_size)
+            if class_buffer.value in excluded:
+                return True
+            if is_exact:
+                exact.append(int(hwnd))
+                return False  # stop enumerating
+            partial.append(int(hwnd))
+            return True
+
+        user32.EnumWindows(EnumWindowsProc(_callback), 0)
+        if exact:
+            return exact[0]
+        return partial[0] if partial else None
 
     def find_window_by_title(title: str) -> Optional[int]:
-        normalized = title.strip().lower()
+        normalized = title.strip().casefold()
         if not normalized:
             return None
-        windows = list_windows()
-        for window in windows:
-            title_value = str(window.get("title", ""))
-            if title_value.lower() == normalized:
-                return int(window.get("hwnd", 0))
-        for window in windows:
-            title_value = str(window.get("title", ""))
-            if normalized in title_value.lower():
-                return int(window.get("hwnd", 0))
-        return None
+        with _cache_lock:
+            entry = _title_cache.get(normalized)
+        if entry is not None:
+            stamp, cached = entry
+            if time.monotonic() - stamp < _TITLE_CACHE_TTL and is_window_valid(cached):
+                return cached
+        hwnd = _find_window_impl(normalized)
+        with _cache_lock:
+            if hwnd is None:
+                _title_cache.pop(normalized, None)
+            else:
+                # Re-insert so dict order stays oldest-first for FIFO eviction.
+                _title_cache.pop(normalized, None)
+                _title_cache[normalized] = (time.monotonic(), hwnd)
+                while len(_title_cache) > _TITLE_CACHE_MAX:
+                    del _title_cache[next(iter(_title_cache))]
+        return hwnd
@@ -8,13 +8,17 @@ these primitives, while unit tests exercise the pure-Python execution code.
 from __future__ import annotations
 
 import ast
-from dataclasses import dataclass, field
+import os
+import string
+from collections import deque
+from dataclasses import dataclass
+from functools import lru_cache
 import shutil
+import sys
+import threading
 import time
 from pathlib import Path
-from typing import Any, Callable, Dict, Iterable, List, Optional, Protocol, Set, Tuple, cast
-
-from window_utils import activate_window, find_window_by_title, is_window_valid
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Protocol, Set, Tuple, Type, cast
 
 
 class ExecutionError(RuntimeError):
@@ -72,6 +76,8 @@ class AutomationRuntime(Protocol):
 
     def get_pixel_color(self, x: int, y: int) -> tuple[int, int, int]: ...
 
+    def screen_size(self) -> tuple[int, int]: ...
+
     def locate_image(
         self,
         image_path: str,
@@ -88,11 +94,29 @@ class AutomationRuntime(Protocol):
     ) -> Tuple[int, str, str]: ...
 
 
-@dataclass
 class ExecutionContext:
-    """Container for node execution results."""
+    """Container for node execution results.
+
+    ``results`` only holds nodes that have actually recorded a value: it is
+    exposed to expressions and Python nodes, where ``"id" in results`` means
+    "already ran", so it is not pre-seeded with the graph's node ids.
+    """
+
+    __slots__ = ("results", "_window_cache", "_stop_event")
+
+    def __init__(
+        self,
+        results: Optional[Dict[str, Any]] = None,
+        stop_event: Optional[threading.Event] = None,
+    ) -> None:
+        self.results: Dict[str, Any] = {} if results is None else results
+        # Window title -> hwnd activated earlier in this run.
+        self._window_cache: Dict[str, int] = {}
+        # Set by the runner to cancel; waits in sleep() wake on it immediately.
+        self._stop_event = stop_event
 
-    results: Dict[str, Any] = field(default_factory=dict)
+    def __repr__(self) -> str:
+        return f"ExecutionContext(results={self.results!r})"
 
     def record(self, node_id: str, value: Any) -> None:
         self.results[node_id] = value
@@ -100,6 +124,21 @@ class ExecutionContext:
     def get(self, node_id: str) -> Any:
         return self.results.get(node_id)
 
+    def get_window_cache(self, title: str) -> Optional[int]:
+        return self._window_cache.get(title)
+
+    def set_window_cache(self, title: str, hwnd: int) -> None:
+        self._window_cache[title] = hwnd
+
+    def sleep(self, seconds: float) -> None:
+        """Sleep for ``seconds``, raising ``ExecutionError`` as soon as the run is stopped."""
+
+        stop_event = self._stop_event
+        if stop_event is None:
+            time.sleep(seconds)
+        elif stop_event.wait(seconds):
+            raise ExecutionError("Execution cancelled")
+
 
 _ALLOWED_EXPR_NODES: tuple[type[ast.AST], ...] = (
     ast.Expression,
@@ -187,6 +226,164 @@ def _validate_expression_ast(tree: ast.AST) -> None:
             raise ExecutionError("不允许访问以 '__' 开头的名称")
 
 
+@lru_cache(maxsize=64)
+def _compile_index_template(template: str) -> Callable[[int], str]:
+    """Return a fast ``index -> name`` formatter equivalent to ``template.format(index=...)``.
+
+    Templates whose only fields are ``{index}``/``{index:spec}`` are parsed once
+    into literal/spec pieces; anything else falls back to ``str.format``.
+    """
+
+    try:
+        parsed = list(string.Formatter().parse(template))
+    except ValueError:
+        parsed = None
+    if parsed is None or any(
+        field is not None and (field != "index" or conversion is not None or "{" in (spec or ""))
+        for _literal, field, spec, conversion in parsed
+    ):
+        return lambda index: template.format(index=index)
+    pieces = [(literal, field is not None, spec or "") for literal, field, spec, _conversion in parsed]
+
+    def render(index: int) -> str:
+        return "".join(
+            literal + format(index, spec) if has_field else literal
+            for literal, has_field, spec in pieces
+        )
+
+    return render
+
+
+@lru_cache(maxsize=64)
+def _parse_hotkey(keys: str) -> Tuple[str, ...]:
+    """Split a ``ctrl+shift+esc`` style hotkey into its stripped key names."""
+
+    return tuple(part.strip() for part in keys.split("+") if part.strip())
+
+
+def _parse_optional_int(value: Any, message: str) -> int | None:
+    """Return ``None`` for an empty field, else an int; ``message`` is the ValueError text."""
+
+    if value is None or value == "":
+        return None
+    value_type = type(value)
+    if value_type is int:
+        return value
+    if value_type is str:
+        text = value.strip()
+        if text:
+            try:
+                return int(text)
+            except ValueError as exc:
+                raise ValueError(message) from exc
+    elif isinstance(value, int):
+        return value
+    raise ValueError(message)
+
+
+# Cheap pixel waits re-check quickly at first, then back off towards their poll interval.
+_POLL_INITIAL_DELAY = 0.05
+_POLL_BACKOFF = 1.5
+
+
+def _poll_delays(poll_interval: float) -> Iterator[float]:
+    """Yield sleep lengths growing geometrically from 50 ms up to ``poll_interval``."""
+
+    delay = min(poll_interval, _POLL_INITIAL_DELAY)
+    while True:
+        yield delay
+        delay = min(delay * _POLL_BACKOFF, poll_interval)
+
+
+if sys.platform == "win32" and sys.version_info < (3, 12):  # pragma: no cover - Windows only
+    import ctypes
+
+    def _copy_file(source: str, destination: str) -> str:
+        """Copy one file with the Windows copy engine, then carry over metadata like copy2.
+
+        Python 3.12+ already routes ``shutil.copy2`` through ``CopyFile2``.
+        """
+
+        kernel32 = ctypes.windll.kernel32
+        if not kernel32.CopyFileExW(str(source), str(destination), None, None, None, 0):
+            raise ctypes.WinError()
+        shutil.copystat(source, destination)
+        return str(destination)
+
+else:
+    # sendfile/copy_file_range on Linux, fcopyfile on macOS, CopyFile2 on newer Windows.
+    _copy_file = shutil.copy2
+
+
+@lru_cache(maxsize=256)
+def _resolve_dir(absolute: str) -> Path:
+    """Return the resolved form of an absolute directory path, resolved once per path."""
+
+    return Path(absolute).resolve()
+
+
+def _transfer_target(source: Path, destination: Path) -> Path:
+    """Return where a copy/move of ``source`` lands: inside ``destination`` if it is a directory."""
+
+    # is_dir() is False for a missing path, so one stat answers both questions.
+    if destination.is_dir():
+        return destination / source.name
+    return destination
+
+
+def _resolved_or_plain(path: Path) -> str:
+    """Return ``path`` resolved if it exists, else unchanged (one strict resolve)."""
+
+    try:
+        return str(path.resolve(strict=True))
+    except OSError:
+        return str(path)
+
+
+def _check_int(key: str, value: Any, _spec: Dict[str, Any]) -> None:
+    if not isinstance(value, int):
+        raise ValueError(f"{key} must be an integer")
+
+
+def _check_number(key: str, value: Any, _spec: Dict[str, Any]) -> None:
+    if not isinstance(value, (int, float)):
+        raise ValueError(f"{key} must be a number")
+
+
+def _check_str(key: str, value: Any, _spec: Dict[str, Any]) -> None:
+    if not isinstance(value, str):
+        raise ValueError(f"{key} must be a string")
+
+
+def _check_choice(key: str, value: Any, spec: Dict[str, Any]) -> None:
+    allowed = [ident for ident, _label in spec.get("choices", ())]
+    if value not in allowed:
+        raise ValueError(f"{key} must be {'/'.join(map(str, allowed))}")
+
+
+# Schema field type -> type check used by WorkflowNodeModel._validate_from_schema.
+# Only types are enforced; schema min/max are editor widget limits, not rules.
+# "float" takes real numbers only, like the isinstance checks it replaced; a node
+# that accepts numeric strings converts them before calling the walker.
+_VALIDATORS: Dict[str, Callable[[str, Any, Dict[str, Any]], None]] = {
+    "int": _check_int,
+    "float": _check_number,
+    "str": _check_str,
+    "multiline": _check_str,
+    "choices": _check_choice,
+}
+
+_SCHEMA_CACHE: Dict[type, Tuple[Dict[str, Any], ...]] = {}
+_DEFAULTS_CACHE: Dict[type, Dict[str, Any]] = {}
+
+_MOUSE_BUTTONS = frozenset({"left", "right", "middle"})
+_SCROLL_ORIENTATIONS = frozenset({"vertical", "horizontal"})
+_YES_NO = frozenset({"yes", "no"})
+_OVERWRITE_CHOICES = frozenset({"覆盖", "跳过"})
+_MAKE_PARENTS_CHOICES = frozenset({"是", "否"})
+_MISSING_CHOICES = frozenset({"忽略", "报错"})
+
+
 def evaluate_expression(
     expression: str,
     context: ExecutionContext,
@@ -221,6 +418,9 @@ def evaluate_condition(
 class WorkflowNodeModel:
     """Base class for workflow node definitions."""
 
+    # Core attributes live in slots; subclasses add slots for any per-node state.
+    __slots__ = ("id", "title", "config")
+
     type_name: str = "base"
     display_name: str = "Base"
     category: str = "其他"
@@ -231,20 +431,41 @@ class WorkflowNodeModel:
         title: Optional[str] = None,
         config: Optional[Dict[str, Any]] = None,
     ) -> None:
-        self.id = node_id
+        # Ids key the graph dicts and execution results; interning them here lets
+        # lookups with the same id object short-circuit on identity.
+        self.id = sys.intern(node_id)
         self.title = title or self.display_name
-        default_cfg = self.default_config()
-        if config is None:
-            self.config: Dict[str, Any] = default_cfg
-        else:
-            merged = default_cfg.copy()
-            merged.update(config)
-            self.config = merged
+        # The cached template is shared, so each node starts from its own dict.
+        defaults = self._cached_defaults()
+        self.config: Dict[str, Any] = defaults.copy() if config is None else {**defaults, **config}
         self.validate_config()
 
     def default_config(self) -> Dict[str, Any]:
         return {}
 
+    def _cached_defaults(self) -> Dict[str, Any]:
+        """Return :meth:`default_config`, built once per node class; callers must copy it."""
+
+        node_cls = type(self)
+        cached = _DEFAULTS_CACHE.get(node_cls)
+        if cached is None:
+            cached = _DEFAULTS_CACHE[node_cls] = self.default_config()
+        return cached
+
+    def _clone(self) -> "WorkflowNodeModel":
+        """Copy this node without re-running ``default_config``/``validate_config``.
+
+        The source config has already been validated, so the copy only needs its
+        own config dict. Per-node runtime state is not carried over.
+        """
+
+        node_cls = type(self)
+        clone = node_cls.__new__(node_cls)
+        clone.id = self.id
+        clone.title = self.title
+        clone.config = self.config.copy()
+        return clone
+
     def validate_config(self) -> None:
         """Validate config values; subclasses should raise ``ValueError``."""
 
@@ -253,6 +474,32 @@ class WorkflowNodeModel:
 
         return []
 
+    def schema(self) -> Tuple[Dict[str, Any], ...]:
+        """Return :meth:`config_schema`, built once per node class and shared read-only.
+
+        A tuple, so callers cannot append to the shared copy by accident.
+        """
+
+        node_cls = type(self)
+        cached = _SCHEMA_CACHE.get(node_cls)
+        if cached is None:
+            cached = _SCHEMA_CACHE[node_cls] = tuple(self.config_schema())
+        return cached
+
+    def _validate_from_schema(self) -> None:
+        """Type-check config values against the schema; float fields are stored as floats."""
+
+        cfg = self.config
+        for spec in self.schema():
+            field_type = spec.get("type", "")
+            check = _VALIDATORS.get(field_type)
+            if check is not None:
+                key = spec["key"]
+                value = cfg.get(key)
+                check(key, value, spec)
+                if field_type == "float":
+                    cfg[key] = float(value)
+
     def execute(self, context: ExecutionContext, runtime: AutomationRuntime) -> Any:
         raise NotImplementedError
 
@@ -275,6 +522,11 @@ class WorkflowNodeModel:
 
 
 class ScreenshotNode(WorkflowNodeModel):
+    # Capture state, reset whenever the config is (re)validated:
+    # _index_hint: (output_dir, filename pattern, last index used); lets repeated
+    #   captures in a loop resume probing after the previous file instead of index 1.
+    __slots__ = ("_index_hint",)
+
     type_name = "screenshot"
     display_name = "截图"
     category = "图像识别"
@@ -292,6 +544,7 @@ class ScreenshotNode(WorkflowNodeModel):
         }
 
     def validate_config(self) -> None:
+        self._index_hint: Optional[Tuple[Path, str, int]] = None
         cfg = self.config
         fullscreen = bool(cfg.get("fullscreen", False))
         cfg["fullscreen"] = fullscreen
@@ -310,6 +563,13 @@ class ScreenshotNode(WorkflowNodeModel):
         if not isinstance(name, str) or not name.strip():
             raise ValueError("filename must not be empty")
         cfg["filename"] = name.strip()
+        # Parse the template now so captures only render it.
+        _compile_index_template(cfg["filename"])
+
+    def _clone(self) -> "WorkflowNodeModel":
+        clone = super()._clone()
+        clone._index_hint = None
+        return clone
 
     def config_schema(self) -> List[Dict[str, Any]]:
         return [
@@ -352,26 +612,49 @@ class ScreenshotNode(WorkflowNodeModel):
             },
         ]
 
+    def _output_directory(self, configured: str) -> Path:
+        # The realpath is cached per absolute path, so a changed working directory
+        # resolves afresh; mkdir is cheap and recreates a directory deleted mid-session.
+        output_dir = _resolve_dir(os.path.abspath(os.path.expanduser(configured)))
+        output_dir.mkdir(parents=True, exist_ok=True)
+        return output_dir
+
     def execute(self, context: ExecutionContext, runtime: AutomationRuntime) -> Path:
         cfg = self.config
-        output_dir = Path(cfg["output_dir"]).expanduser().resolve()
-        output_dir.mkdir(parents=True, exist_ok=True)
+        output_dir = self._output_directory(cfg["output_dir"])
         template = str(cfg["filename"])
         overwrite = bool(cfg.get("overwrite", False))
         
-        def next_available_with_index(pattern: str) -> str:
-            i = 1
+        def first_free(pattern: str, render: Callable[[int], str], start: int) -> str:
+            hint = self._index_hint
+            if hint is not None and hint[:2] == (output_dir, pattern):
+                i = hint[2] + 1
+                taken = None
+            else:
+                # Cold start: one directory read instead of an exists() probe per index.
+                i = start
+                with os.scandir(output_dir) as entries:
+                    taken = {entry.name for entry in entries}
             while True:
                 try:
-                    candidate = pattern.format(index=i)
+                    candidate = render(i)
                 except Exception:
                     # 如果占位符不合法，回退为原样
                     return pattern
-                target = output_dir / candidate
-                if not target.exists():
+                if taken is not None:
+                    # The listing compares names case-sensitively; confirm with the
+                    # filesystem so e.g. Shot_1.png on Windows also blocks shot_1.png.
+                    free = candidate not in taken and not (output_dir / candidate).exists()
+                else:
+                    free = not (output_dir / candidate).exists()
+                if free:
+                    self._index_hint = (output_dir, pattern, i)
                     return candidate
                 i += 1
 
+        def next_available_with_index(pattern: str) -> str:
+            return first_free(pattern, _compile_index_template(pattern), 1)
+
         def uniquify(name: str) -> str:
             base = name
             stem = base
@@ -379,19 +662,17 @@ class ScreenshotNode(WorkflowNodeModel):
             if "." in base:
                 stem = base[: base.rfind(".")]
                 suffix = base[base.rfind("."):]
-            i = 1
-            candidate = base
-            while (output_dir / candidate).exists():
-                candidate = f"{stem} ({i}){suffix}"
-                i += 1
-            return candidate
+            # Index 0 is the plain name; later ones add a " (n)" counter.
+            return first_free(
+                base, lambda i: f"{stem} ({i}){suffix}" if i else base, 0
+            )
 
         # 根据覆盖选项决定文件名处理方式
         if overwrite:
             # 覆盖模式：直接使用模板文件名（如果有 {index}，使用 index=1）
             if "{index" in template:
                 try:
-                    filename = template.format(index=1)
+                    filename = _compile_index_template(template)(1)
                 except Exception:
                     filename = template
             else:
@@ -448,12 +729,19 @@ class ScreenshotNode(WorkflowNodeModel):
             region = (cfg["x"], cfg["y"], cfg["width"], cfg["height"])
             path = runtime.take_screenshot(region)
         target_path = output_dir / filename
-        shutil.move(str(path), target_path)
+        try:
+            # Same-volume fast path: a single rename that also replaces an existing file.
+            os.replace(path, target_path)
+        except OSError:
+            # Cross-device (EXDEV) or other rename failures take the copy fallback.
+            shutil.move(str(path), target_path)
         context.record(self.id, str(target_path))
         return target_path
 
 
 class MouseClickNode(WorkflowNodeModel):
+    __slots__ = ()
+
     type_name = "mouse_click"
     display_name = "鼠标点击"
     category = "鼠标操作"
@@ -469,16 +757,11 @@ class MouseClickNode(WorkflowNodeModel):
         }
 
     def validate_config(self) -> None:
+        self._validate_from_schema()
         cfg = self.config
-        if not isinstance(cfg.get("x"), int) or not isinstance(cfg.get("y"), int):
-            raise ValueError("x/y must be integers")
-        if cfg.get("button") not in {"left", "right", "middle"}:
-            raise ValueError("button must be left/right/middle")
-        clicks = cfg.get("clicks")
-        if not isinstance(clicks, int) or clicks <= 0:
+        if cfg["clicks"] <= 0:
             raise ValueError("clicks must be a positive integer")
-        interval = cfg.get("interval")
-        if not isinstance(interval, (int, float)) or interval < 0:
+        if cfg["interval"] < 0:
             raise ValueError("interval must be non-negative")
 
     def config_schema(self) -> List[Dict[str, Any]]:
@@ -515,13 +798,15 @@ class MouseClickNode(WorkflowNodeModel):
             cfg["y"],
             cfg["button"],
             cfg["clicks"],
-            float(cfg["interval"]),
+            cfg["interval"],
         )
         context.record(self.id, "ok")
         return None
 
 
 class KeyboardInputNode(WorkflowNodeModel):
+    __slots__ = ()
+
     type_name = "keyboard_input"
     display_name = "键盘输入"
     category = "键盘操作"
@@ -533,11 +818,8 @@ class KeyboardInputNode(WorkflowNodeModel):
         }
 
     def validate_config(self) -> None:
-        cfg = self.config
-        if not isinstance(cfg.get("text"), str):
-            raise ValueError("text must be a string")
-        interval = cfg.get("interval")
-        if not isinstance(interval, (int, float)) or interval < 0:
+        self._validate_from_schema()
+        if self.config["interval"] < 0:
             raise ValueError("interval must be non-negative")
 
     def config_schema(self) -> List[Dict[str, Any]]:
@@ -554,12 +836,14 @@ class KeyboardInputNode(WorkflowNodeModel):
         ]
 
     def execute(self, context: ExecutionContext, runtime: AutomationRuntime) -> None:
-        runtime.type_text(self.config["text"], float(self.config["interval"]))
+        runtime.type_text(self.config["text"], self.config["interval"])
         context.record(self.id, "ok")
         return None
 
 
 class MouseMoveNode(WorkflowNodeModel):
+    __slots__ = ()
+
     type_name = "mouse_move"
     display_name = "鼠标移动"
     category = "鼠标操作"
@@ -568,12 +852,8 @@ class MouseMoveNode(WorkflowNodeModel):
         return {"x": 100, "y": 100, "duration": 0.2}
 
     def validate_config(self) -> None:
-        cfg = self.config
-        for axis in ("x", "y"):
-            if not isinstance(cfg.get(axis), int):
-                raise ValueError(f"{axis} must be an integer")
-        duration = cfg.get("duration")
-        if not isinstance(duration, (int, float)) or duration < 0:
+        self._validate_from_schema()
+        if self.config["duration"] < 0:
             raise ValueError("duration must be non-negative")
 
     def config_schema(self) -> List[Dict[str, Any]]:
@@ -592,12 +872,14 @@ class MouseMoveNode(WorkflowNodeModel):
 
     def execute(self, context: ExecutionContext, runtime: AutomationRuntime) -> None:
         cfg = self.config
-        runtime.move_mouse(cfg["x"], cfg["y"], float(cfg["duration"]))
+        runtime.move_mouse(cfg["x"], cfg["y"], cfg["duration"])
         context.record(self.id, "ok")
         return None
 
 
 class MouseDragNode(WorkflowNodeModel):
+    __slots__ = ()
+
     type_name = "mouse_drag"
     display_name = "鼠标拖拽"
     category = "鼠标操作"
@@ -614,15 +896,10 @@ class MouseDragNode(WorkflowNodeModel):
         }
 
     def validate_config(self) -> None:
+        self._validate_from_schema()
         cfg = self.config
-        for axis in ("start_x", "start_y", "end_x", "end_y"):
-            if not isinstance(cfg.get(axis), int):
-                raise ValueError(f"{axis} must be an integer")
-        if cfg.get("button") not in {"left", "right", "middle"}:
-            raise ValueError("button must be left/right/middle")
         for key in ("move_duration", "drag_duration"):
-            value = cfg.get(key)
-            if not isinstance(value, (int, float)) or value < 0:
+            if cfg[key] < 0:
                 raise ValueError(f"{key} must be non-negative")
 
     def config_schema(self) -> List[Dict[str, Any]]:
@@ -663,14 +940,16 @@ class MouseDragNode(WorkflowNodeModel):
             cfg["end_x"],
             cfg["end_y"],
             cfg["button"],
-            float(cfg["move_duration"]),
-            float(cfg["drag_duration"]),
+            cfg["move_duration"],
+            cfg["drag_duration"],
         )
         context.record(self.id, "ok")
         return None
 
 
 class MouseScrollNode(WorkflowNodeModel):
+    __slots__ = ()
+
     type_name = "mouse_scroll"
     display_name = "鼠标滚轮"
     category = "鼠标操作"
@@ -683,27 +962,15 @@ class MouseScrollNode(WorkflowNodeModel):
             "y": "",
         }
 
-    def _parse_optional_coordinate(self, value: Any) -> int | None:
-        if value in ("", None):
-            return None
-        if isinstance(value, int):
-            return value
-        if isinstance(value, str) and value.strip():
-            try:
-                return int(value.strip())
-            except ValueError as exc:  # pragma: no cover - validation handles message
-                raise ValueError("坐标必须为整数或留空") from exc
-        raise ValueError("坐标必须为整数或留空")
-
     def validate_config(self) -> None:
         cfg = self.config
         clicks = cfg.get("clicks")
         if not isinstance(clicks, int) or clicks == 0:
             raise ValueError("clicks must be a non-zero integer")
-        if cfg.get("orientation") not in {"vertical", "horizontal"}:
+        if cfg.get("orientation") not in _SCROLL_ORIENTATIONS:
             raise ValueError("orientation must be vertical/horizontal")
-        self.config["x"] = self._parse_optional_coordinate(cfg.get("x"))
-        self.config["y"] = self._parse_optional_coordinate(cfg.get("y"))
+        self.config["x"] = _parse_optional_int(cfg.get("x"), "坐标必须为整数或留空")
+        self.config["y"] = _parse_optional_int(cfg.get("y"), "坐标必须为整数或留空")
 
     def config_schema(self) -> List[Dict[str, Any]]:
         return [
@@ -739,6 +1006,8 @@ class MouseScrollNode(WorkflowNodeModel):
 
 
 class MouseDownNode(WorkflowNodeModel):
+    __slots__ = ()
+
     type_name = "mouse_down"
     display_name = "鼠标按下"
     category = "鼠标操作"
@@ -747,12 +1016,7 @@ class MouseDownNode(WorkflowNodeModel):
         return {"x": 100, "y": 100, "button": "left"}
 
     def validate_config(self) -> None:
-        cfg = self.config
-        for axis in ("x", "y"):
-            if not isinstance(cfg.get(axis), int):
-                raise ValueError(f"{axis} must be an integer")
-        if cfg.get("button") not in {"left", "right", "middle"}:
-            raise ValueError("button must be left/right/middle")
+        self._validate_from_schema()
 
     def config_schema(self) -> List[Dict[str, Any]]:
         return [
@@ -774,6 +1038,8 @@ class MouseDownNode(WorkflowNodeModel):
 
 
 class MouseUpNode(WorkflowNodeModel):
+    __slots__ = ()
+
     type_name = "mouse_up"
     display_name = "鼠标抬起"
     category = "鼠标操作"
@@ -782,12 +1048,7 @@ class MouseUpNode(WorkflowNodeModel):
         return {"x": 100, "y": 100, "button": "left"}
 
     def validate_config(self) -> None:
-        cfg = self.config
-        for axis in ("x", "y"):
-            if not isinstance(cfg.get(axis), int):
-                raise ValueError(f"{axis} must be an integer")
-        if cfg.get("button") not in {"left", "right", "middle"}:
-            raise ValueError("button must be left/right/middle")
+        self._validate_from_schema()
 
     def config_schema(self) -> List[Dict[str, Any]]:
         return [
@@ -809,6 +1070,8 @@ class MouseUpNode(WorkflowNodeModel):
 
 
 class KeyPressNode(WorkflowNodeModel):
+    __slots__ = ()
+
     type_name = "key_press"
     display_name = "按键触发"
     category = "键盘操作"
@@ -817,14 +1080,13 @@ class KeyPressNode(WorkflowNodeModel):
         return {"key": "enter", "presses": 1, "interval": 0.05}
 
     def validate_config(self) -> None:
+        self._validate_from_schema()
         cfg = self.config
-        if not isinstance(cfg.get("key"), str) or not cfg["key"].strip():
+        if not cfg["key"].strip():
             raise ValueError("key must be a non-empty string")
-        presses = cfg.get("presses")
-        if not isinstance(presses, int) or presses <= 0:
+        if cfg["presses"] <= 0:
             raise ValueError("presses must be a positive integer")
-        interval = cfg.get("interval")
-        if not isinstance(interval, (int, float)) or interval < 0:
+        if cfg["interval"] < 0:
             raise ValueError("interval must be non-negative")
 
     def config_schema(self) -> List[Dict[str, Any]]:
@@ -849,12 +1111,14 @@ class KeyPressNode(WorkflowNodeModel):
 
     def execute(self, context: ExecutionContext, runtime: AutomationRuntime) -> None:
         cfg = self.config
-        runtime.press_key(cfg["key"].strip(), cfg["presses"], float(cfg["interval"]))
+        runtime.press_key(cfg["key"].strip(), cfg["presses"], cfg["interval"])
         context.record(self.id, "ok")
         return None
 
 
 class HotkeyNode(WorkflowNodeModel):
+    __slots__ = ()
+
     type_name = "hotkey"
     display_name = "组合按键"
     category = "键盘操作"
@@ -863,11 +1127,11 @@ class HotkeyNode(WorkflowNodeModel):
         return {"keys": "ctrl+shift+esc", "interval": 0.05}
 
     def validate_config(self) -> None:
+        self._validate_from_schema()
         cfg = self.config
-        if not isinstance(cfg.get("keys"), str) or not cfg["keys"].strip():
+        if not _parse_hotkey(cfg["keys"]):
             raise ValueError("keys must be a non-empty string")
-        interval = cfg.get("interval")
-        if not isinstance(interval, (int, float)) or interval < 0:
+        if cfg["interval"] < 0:
             raise ValueError("interval must be non-negative")
 
     def config_schema(self) -> List[Dict[str, Any]]:
@@ -885,15 +1149,17 @@ class HotkeyNode(WorkflowNodeModel):
 
     def execute(self, context: ExecutionContext, runtime: AutomationRuntime) -> None:
         cfg = self.config
-        keys = [part.strip() for part in cfg["keys"].split("+") if part.strip()]
+        keys = _parse_hotkey(cfg["keys"])
         if not keys:
             raise ExecutionError("组合按键列表不能为空")
-        runtime.press_hotkey(keys, float(cfg["interval"]))
+        runtime.press_hotkey(list(keys), cfg["interval"])
         context.record(self.id, "ok")
         return None
 
 
 class KeyDownNode(WorkflowNodeModel):
+    __slots__ = ()
+
     type_name = "key_down"
     display_name = "按键按下"
     category = "键盘操作"
@@ -902,8 +1168,8 @@ class KeyDownNode(WorkflowNodeModel):
         return {"key": "shift"}
 
     def validate_config(self) -> None:
-        key = self.config.get("key")
-        if not isinstance(key, str) or not key.strip():
+        self._validate_from_schema()
+        if not self.config["key"].strip():
             raise ValueError("key must be a non-empty string")
 
     def config_schema(self) -> List[Dict[str, Any]]:
@@ -916,6 +1182,8 @@ class KeyDownNode(WorkflowNodeModel):
 
 
 class KeyUpNode(WorkflowNodeModel):
+    __slots__ = ()
+
     type_name = "key_up"
     display_name = "按键抬起"
     category = "键盘操作"
@@ -924,8 +1192,8 @@ class KeyUpNode(WorkflowNodeModel):
         return {"key": "shift"}
 
     def validate_config(self) -> None:
-        key = self.config.get("key")
-        if not isinstance(key, str) or not key.strip():
+        self._validate_from_schema()
+        if not self.config["key"].strip():
             raise ValueError("key must be a non-empty string")
 
     def config_schema(self) -> List[Dict[str, Any]]:
@@ -938,6 +1206,8 @@ class KeyUpNode(WorkflowNodeModel):
 
 
 class DelayNode(WorkflowNodeModel):
+    __slots__ = ()
+
     type_name = "delay"
     display_name = "延迟等待"
     category = "流程控制"
@@ -946,8 +1216,8 @@ class DelayNode(WorkflowNodeModel):
         return {"seconds": 1.0}
 
     def validate_config(self) -> None:
-        seconds = self.config.get("seconds")
-        if not isinstance(seconds, (int, float)) or seconds < 0:
+        self._validate_from_schema()
+        if self.config["seconds"] < 0:
             raise ValueError("seconds must be non-negative")
 
     def config_schema(self) -> List[Dict[str, Any]]:
@@ -963,16 +1233,25 @@ class DelayNode(WorkflowNodeModel):
         ]
 
     def execute(self, context: ExecutionContext, runtime: AutomationRuntime) -> None:  # noqa: ARG002
-        time.sleep(float(self.config["seconds"]))
+        context.sleep(self.config["seconds"])
         context.record(self.id, "ok")
         return None
 
 
 class ImageLocateNode(WorkflowNodeModel):
+    # _last_hit: one-item list holding (image_path, x, y) of the last match, or None;
+    # shared with clones so the hint outlives the per-run graph copy. Only used
+    # when no region is set.
+    # _region: search region from the validated region_* fields, or None for full screen.
+    __slots__ = ("_last_hit", "_region")
+
     type_name = "image_locate"
     display_name = "图像定位"
     category = "图像识别"
 
+    # Half-size of the square searched around the previous match before the full screen.
+    HINT_MARGIN = 256
+
     def default_config(self) -> Dict[str, Any]:
         return {
             "image_path": "",
@@ -984,19 +1263,6 @@ class ImageLocateNode(WorkflowNodeModel):
             "region_height": "",
         }
 
-    @staticmethod
-    def _parse_optional_int(value: Any, field_name: str) -> int | None:
-        if value in ("", None):
-            return None
-        if isinstance(value, int):
-            return value
-        if isinstance(value, str) and value.strip():
-            try:
-                return int(value.strip())
-            except ValueError as exc:
-                raise ValueError(f"{field_name} 必须为整数或留空") from exc
-        raise ValueError(f"{field_name} 必须为整数或留空")
-
     def validate_config(self) -> None:
         cfg = self.config
         image_path = cfg.get("image_path")
@@ -1011,12 +1277,10 @@ class ImageLocateNode(WorkflowNodeModel):
             raise ValueError("confidence must be in (0, 1]")
         cfg["confidence"] = confidence_val
         grayscale = cfg.get("grayscale", "no")
-        if grayscale not in {"yes", "no"}:
+        if grayscale not in _YES_NO:
             raise ValueError("grayscale must be 'yes' or 'no'")
-        cfg["region_x"] = self._parse_optional_int(cfg.get("region_x"), "region_x")
-        cfg["region_y"] = self._parse_optional_int(cfg.get("region_y"), "region_y")
-        cfg["region_width"] = self._parse_optional_int(cfg.get("region_width"), "region_width")
-        cfg["region_height"] = self._parse_optional_int(cfg.get("region_height"), "region_height")
+        for key in ("region_x", "region_y", "region_width", "region_height"):
+            cfg[key] = _parse_optional_int(cfg.get(key), f"{key} 必须为整数或留空")
         width = cfg["region_width"]
         height = cfg["region_height"]
         if width is not None and width <= 0:
@@ -1042,6 +1306,13 @@ class ImageLocateNode(WorkflowNodeModel):
             )
         ):
             raise ValueError("region fields must be all provided or all empty")
+        # Built once here; execute() reuses it until the next validation.
+        self._last_hit: List[Optional[Tuple[str, int, int]]] = [None]
+        self._region: Optional[Tuple[int, int, int, int]] = (
+            None
+            if cfg["region_x"] is None
+            else (cfg["region_x"], cfg["region_y"], cfg["region_width"], cfg["region_height"])
+        )
 
     def config_schema(self) -> List[Dict[str, Any]]:
         return [
@@ -1073,28 +1344,64 @@ class ImageLocateNode(WorkflowNodeModel):
         ]
 
     def _build_region(self) -> tuple[int, int, int, int] | None:
+        return self._region
+
+    def _clone(self) -> "WorkflowNodeModel":
+        clone = super()._clone()
+        # Derived from the (already validated) config, so it carries over. The
+        # match hint is shared: runs execute a copy of the graph, and hits found
+        # there should speed up the next run of the original node.
+        clone._region = self._region
+        clone._last_hit = self._last_hit
+        return clone
+
+    def _search_args(self) -> Tuple[str, float, tuple[int, int, int, int] | None, bool]:
+        """Return the ``locate_image`` arguments, read from config once per execute."""
+
         cfg = self.config
-        if cfg["region_x"] is None:
-            return None
-        return (
-            int(cfg["region_x"]),
-            int(cfg["region_y"]),
-            int(cfg["region_width"]),
-            int(cfg["region_height"]),
-        )
+        return cfg["image_path"], cfg["confidence"], self._build_region(), cfg["grayscale"] == "yes"
+
+    def _locate(
+        self,
+        locate_image: Callable[..., tuple[int, int] | None],
+        screen_size: tuple[int, int],
+        image_path: str,
+        confidence: float,
+        region: tuple[int, int, int, int] | None,
+        grayscale: bool,
+    ) -> tuple[int, int] | None:
+        last_hit = self._last_hit
+        hit = last_hit[0]
+        if region is None and hit is not None and hit[0] == image_path:
+            # Targets rarely move between runs, so match the small area around the
+            # previous hit first; a miss falls through to the full-screen search.
+            margin = self.HINT_MARGIN
+            left = max(hit[1] - margin, 0)
+            top = max(hit[2] - margin, 0)
+            width = min(hit[1] + margin, screen_size[0]) - left
+            height = min(hit[2] + margin, screen_size[1]) - top
+            location = None
+            if width > 0 and height > 0:
+                try:
+                    location = locate_image(
+                        image_path, confidence, (left, top, width, height), grayscale
+                    )
+                except ValueError:
+                    # Raised by the matcher when the needle is larger than the area.
+                    location = None
+            if location is not None:
+                return location
+            last_hit[0] = None
+        location = locate_image(image_path, confidence, region, grayscale)
+        if location is not None and region is None:
+            last_hit[0] = (image_path, int(location[0]), int(location[1]))
+        return location
 
     def execute(self, context: ExecutionContext, runtime: AutomationRuntime) -> Dict[str, int]:
-        cfg = self.config
-        region = self._build_region()
-        image_path = cfg["image_path"]
-        if not image_path:
+        args = self._search_args()
+        if not args[0]:
             raise ExecutionError("图像路径不能为空")
-        location = runtime.locate_image(
-            image_path,
-            float(cfg["confidence"]),
-            region,
-            cfg["grayscale"] == "yes",
-        )
+        location = self._locate(runtime.locate_image, runtime.screen_size(), *args)
         if location is None:
             raise ExecutionError("未能在屏幕上找到目标图像")
         result = {"x": location[0], "y": location[1]}
@@ -1103,6 +1410,8 @@ class ImageLocateNode(WorkflowNodeModel):
 
 
 class WaitForImageNode(ImageLocateNode):
+    __slots__ = ()
+
     type_name = "wait_for_image"
     display_name = "等待图像出现"
     category = "图像识别"
@@ -1159,28 +1468,34 @@ class WaitForImageNode(ImageLocateNode):
 
     def execute(self, context: ExecutionContext, runtime: AutomationRuntime) -> Dict[str, int]:
         cfg = self.config
-        deadline = time.monotonic() + float(cfg["timeout"])
-        image_path = cfg["image_path"]
-        if not image_path:
+        monotonic = time.monotonic
+        deadline = monotonic() + cfg["timeout"]
+        args = self._search_args()
+        if not args[0]:
             raise ExecutionError("图像路径不能为空")
+        # Everything the poll loop needs is bound up front; each pass is one search.
+        locate = self._locate
+        locate_image = runtime.locate_image
+        screen_size = runtime.screen_size()
+        sleep = context.sleep
+        # Fixed interval: every poll is a full template match, so backing off
+        # from a short first delay would only add expensive searches.
+        poll_interval = cfg["poll_interval"]
         while True:
-            region = self._build_region()
-            location = runtime.locate_image(
-                image_path,
-                float(cfg["confidence"]),
-                region,
-                cfg["grayscale"] == "yes",
-            )
+            location = locate(locate_image, screen_size, *args)
             if location is not None:
                 result = {"x": location[0], "y": location[1]}
                 context.record(self.id, result)
                 return result
-            if time.monotonic() >= deadline:
+            remaining = deadline - monotonic()
+            if remaining <= 0:
                 raise ExecutionError("等待图像超时")
-            time.sleep(float(cfg["poll_interval"]))
+            sleep(min(poll_interval, remaining))
 
 
 class ClickImageNode(ImageLocateNode):
+    __slots__ = ()
+
     type_name = "click_image"
     display_name = "图像点击"
     category = "图像识别"
@@ -1205,7 +1520,8 @@ class ClickImageNode(ImageLocateNode):
             value = cfg.get(key)
             if not isinstance(value, int):
                 raise ValueError(f"{key} must be an integer")
-        if cfg.get("click_button") not in {"left", "right", "middle"}:
+            cfg[key] = int(value)
+        if cfg.get("click_button") not in _MOUSE_BUTTONS:
             raise ValueError("click_button must be left/right/middle")
         clicks = cfg.get("clicks")
         if not isinstance(clicks, int) or clicks <= 0:
@@ -1213,6 +1529,8 @@ class ClickImageNode(ImageLocateNode):
         interval = cfg.get("interval")
         if not isinstance(interval, (int, float)) or interval < 0:
             raise ValueError("interval must be non-negative")
+        # Stored as plain int/float so execute can pass them through untouched.
+        cfg["clicks"] = int(clicks)
         cfg["interval"] = float(interval)
 
     def config_schema(self) -> List[Dict[str, Any]]:
@@ -1261,14 +1579,14 @@ class ClickImageNode(ImageLocateNode):
     def execute(self, context: ExecutionContext, runtime: AutomationRuntime) -> Dict[str, int]:
         location = super().execute(context, runtime)
         cfg = self.config
-        click_x = int(location["x"]) + int(cfg["offset_x"])
-        click_y = int(location["y"]) + int(cfg["offset_y"])
+        click_x = int(location["x"]) + cfg["offset_x"]
+        click_y = int(location["y"]) + cfg["offset_y"]
         runtime.mouse_click(
             click_x,
             click_y,
             cfg["click_button"],
-            int(cfg["clicks"]),
-            float(cfg["interval"]),
+            cfg["clicks"],
+            cfg["interval"],
         )
         result = {"x": click_x, "y": click_y}
         context.record(self.id, result)
@@ -1276,6 +1594,9 @@ class ClickImageNode(ImageLocateNode):
 
 
 class PixelColorNode(WorkflowNodeModel):
+    # Expected (r, g, b) from the validated config, or None when any channel is blank.
+    __slots__ = ("_expected",)
+
     type_name = "pixel_color"
     display_name = "读取像素颜色"
     category = "图像识别"
@@ -1290,18 +1611,6 @@ class PixelColorNode(WorkflowNodeModel):
             "tolerance": 10,
         }
 
-    def _parse_optional_color(self, value: Any, channel: str) -> int | None:
-        if value in ("", None):
-            return None
-        if isinstance(value, int):
-            return value
-        if isinstance(value, str) and value.strip():
-            try:
-                return int(value.strip())
-            except ValueError as exc:
-                raise ValueError(f"{channel} 必须为 0-255 的整数或留空") from exc
-        raise ValueError(f"{channel} 必须为 0-255 的整数或留空")
-
     def validate_config(self) -> None:
         cfg = self.config
         for axis in ("x", "y"):
@@ -1311,10 +1620,20 @@ class PixelColorNode(WorkflowNodeModel):
         if not isinstance(tolerance, int) or tolerance < 0:
             raise ValueError("tolerance must be a non-negative integer")
         for channel in ("expect_r", "expect_g", "expect_b"):
-            value = self._parse_optional_color(cfg.get(channel), channel)
+            value = cfg.get(channel)
+            # Ints (the usual stored form) skip the parser and its error-message formatting.
+            if type(value) is not int:
+                value = _parse_optional_int(value, f"{channel} 必须为 0-255 的整数或留空")
             if value is not None and not 0 <= value <= 255:
                 raise ValueError(f"{channel} must be between 0 and 255")
             cfg[channel] = value
+        expected = (cfg["expect_r"], cfg["expect_g"], cfg["expect_b"])
+        self._expected: Optional[Tuple[int, int, int]] = None if None in expected else expected
+
+    def _clone(self) -> "WorkflowNodeModel":
+        clone = super()._clone()
+        clone._expected = self._expected
+        return clone
 
     def config_schema(self) -> List[Dict[str, Any]]:
         return [
@@ -1336,18 +1655,14 @@ class PixelColorNode(WorkflowNodeModel):
         cfg = self.config
         r, g, b = runtime.get_pixel_color(cfg["x"], cfg["y"])
         result = {"r": r, "g": g, "b": b}
-        expect_r = cfg.get("expect_r")
-        expect_g = cfg.get("expect_g")
-        expect_b = cfg.get("expect_b")
-        tolerance = int(cfg.get("tolerance", 0))
-        if all(channel is not None for channel in (expect_r, expect_g, expect_b)):
-            exp_r = int(cast(int, expect_r))
-            exp_g = int(cast(int, expect_g))
-            exp_b = int(cast(int, expect_b))
+        expected = self._expected
+        if expected is not None:
+            tolerance = cfg["tolerance"]
+            exp_r, exp_g, exp_b = expected
             if not (
-                abs(r - exp_r) <= tolerance
-                and abs(g - exp_g) <= tolerance
-                and abs(b - exp_b) <= tolerance
+                exp_r - tolerance <= r <= exp_r + tolerance
+                and exp_g - tolerance <= g <= exp_g + tolerance
+                and exp_b - tolerance <= b <= exp_b + tolerance
             ):
                 raise ExecutionError("像素颜色与期望值不匹配")
         context.record(self.id, result)
@@ -1355,6 +1670,8 @@ class PixelColorNode(WorkflowNodeModel):
 
 
 class WaitForPixelColorNode(PixelColorNode):
+    __slots__ = ()
+
     type_name = "wait_for_pixel"
     display_name = "等待像素颜色"
     category = "图像识别"
@@ -1375,7 +1692,7 @@ class WaitForPixelColorNode(PixelColorNode):
     def validate_config(self) -> None:
         super().validate_config()
         cfg = self.config
-        if any(cfg.get(channel) is None for channel in ("expect_r", "expect_g", "expect_b")):
+        if self._expected is None:
             raise ValueError("必须设置完整的期望RGB数值")
         timeout = cfg.get("timeout")
         poll = cfg.get("poll_interval")
@@ -1414,30 +1731,33 @@ class WaitForPixelColorNode(PixelColorNode):
 
     def execute(self, context: ExecutionContext, runtime: AutomationRuntime) -> Dict[str, int]:
         cfg = self.config
-        target = (
-            int(cast(int, cfg["expect_r"])),
-            int(cast(int, cfg["expect_g"])),
-            int(cast(int, cfg["expect_b"])),
-        )
-        tolerance = int(cfg.get("tolerance", 0))
-        deadline = time.monotonic() + float(cfg["timeout"])
-        poll = float(cfg["poll_interval"])
+        tolerance = cfg["tolerance"]
+        # Per-channel bounds computed once, so each poll is three chained comparisons.
+        exp_r, exp_g, exp_b = cast(Tuple[int, int, int], self._expected)
+        r_lo, r_hi = exp_r - tolerance, exp_r + tolerance
+        g_lo, g_hi = exp_g - tolerance, exp_g + tolerance
+        b_lo, b_hi = exp_b - tolerance, exp_b + tolerance
+        x, y = cfg["x"], cfg["y"]
+        get_pixel_color = runtime.get_pixel_color
+        monotonic = time.monotonic
+        sleep = context.sleep
+        deadline = monotonic() + cfg["timeout"]
+        delays = _poll_delays(cfg["poll_interval"])
         while True:
-            r, g, b = runtime.get_pixel_color(cfg["x"], cfg["y"])
-            if (
-                abs(r - target[0]) <= tolerance
-                and abs(g - target[1]) <= tolerance
-                and abs(b - target[2]) <= tolerance
-            ):
+            r, g, b = get_pixel_color(x, y)
+            if r_lo <= r <= r_hi and g_lo <= g <= g_hi and b_lo <= b <= b_hi:
                 result = {"r": r, "g": g, "b": b}
                 context.record(self.id, result)
                 return result
-            if time.monotonic() >= deadline:
+            remaining = deadline - monotonic()
+            if remaining <= 0:
                 raise ExecutionError("等待像素颜色超时")
-            time.sleep(poll)
+            sleep(min(next(delays), remaining))
 
 
 class MoveMouseToResultNode(WorkflowNodeModel):
+    __slots__ = ()
+
     type_name = "move_to_result"
     display_name = "移动到结果坐标"
     category = "鼠标操作"
@@ -1476,12 +1796,14 @@ class MoveMouseToResultNode(WorkflowNodeModel):
         result = context.get(source_id)
         if not isinstance(result, dict) or "x" not in result or "y" not in result:
             raise ExecutionError("来源节点的结果不包含坐标信息")
-        runtime.move_mouse(int(result["x"]), int(result["y"]), float(self.config["duration"]))
+        runtime.move_mouse(int(result["x"]), int(result["y"]), self.config["duration"])
         context.record(self.id, {"x": int(result["x"]), "y": int(result["y"])})
         return None
 
 
 class FileCopyNode(WorkflowNodeModel):
+    __slots__ = ()
+
     type_name = "file_copy"
     display_name = "复制文件/目录"
     category = "系统操作"
@@ -1503,10 +1825,10 @@ class FileCopyNode(WorkflowNodeModel):
         if not isinstance(destination, str):
             raise ValueError("destination_path 必须是字符串")
         overwrite = cfg.get("overwrite", "覆盖")
-        if overwrite not in {"覆盖", "跳过"}:
+        if overwrite not in _OVERWRITE_CHOICES:
             raise ValueError("overwrite 必须为 覆盖 或 跳过")
         make_parents = cfg.get("make_parents", "是")
-        if make_parents not in {"是", "否"}:
+        if make_parents not in _MAKE_PARENTS_CHOICES:
             raise ValueError("make_parents 必须为 是 或 否")
         cfg["source_path"] = source.strip()
         cfg["destination_path"] = destination.strip()
@@ -1551,23 +1873,24 @@ class FileCopyNode(WorkflowNodeModel):
             raise ExecutionError("源路径未设置")
         if not dest_value:
             raise ExecutionError("目标路径未设置")
-        source = Path(source_value).expanduser()
-        if not source.exists():
+        source_str = os.path.expanduser(source_value)
+        if not os.path.exists(source_str):
             raise ExecutionError("源路径不存在")
-        destination = Path(dest_value).expanduser()
+        source = Path(source_str)
+        destination = Path(os.path.expanduser(dest_value))
         overwrite = cfg.get("overwrite", "覆盖") == "覆盖"
         make_parents = cfg.get("make_parents", "是") == "是"
 
-        final_target = self._determine_target_path(source, destination)
+        source_is_dir = os.path.isdir(source_str)
+        final_target = _transfer_target(source, destination)
         if final_target.exists():
-            if source.is_dir() and final_target.is_file():
+            if source_is_dir and final_target.is_file():
                 raise ExecutionError("目标路径是文件，无法覆盖目录")
-            if not overwrite:
-                context.record(self.id, str(final_target.resolve()))
-                return str(final_target.resolve())
-            if final_target.resolve() == source.resolve():
-                context.record(self.id, str(final_target.resolve()))
-                return str(final_target.resolve())
+            # Resolved once: every branch below either reports or compares it.
+            resolved_target = final_target.resolve()
+            if not overwrite or resolved_target == source.resolve():
+                context.record(self.id, str(resolved_target))
+                return str(resolved_target)
             if final_target.is_dir():
                 shutil.rmtree(final_target)
             else:
@@ -1580,23 +1903,19 @@ class FileCopyNode(WorkflowNodeModel):
             else:
                 raise ExecutionError("目标父目录不存在")
 
-        if source.is_dir():
-            shutil.copytree(source, final_target)
+        if source_is_dir:
+            shutil.copytree(source, final_target, copy_function=_copy_file)
         else:
-            shutil.copy2(source, final_target)
+            _copy_file(str(source), str(final_target))
 
-        result = str(final_target.resolve()) if final_target.exists() else str(final_target)
+        result = _resolved_or_plain(final_target)
         context.record(self.id, result)
         return result
 
-    @staticmethod
-    def _determine_target_path(source: Path, destination: Path) -> Path:
-        if destination.exists() and destination.is_dir():
-            return destination / source.name
-        return destination
-
 
 class FileMoveNode(WorkflowNodeModel):
+    __slots__ = ()
+
     type_name = "file_move"
     display_name = "移动文件/目录"
     category = "系统操作"
@@ -1618,10 +1937,10 @@ class FileMoveNode(WorkflowNodeModel):
         if not isinstance(destination, str):
             raise ValueError("destination_path 必须是字符串")
         overwrite = cfg.get("overwrite", "覆盖")
-        if overwrite not in {"覆盖", "跳过"}:
+        if overwrite not in _OVERWRITE_CHOICES:
             raise ValueError("overwrite 必须为 覆盖 或 跳过")
         make_parents = cfg.get("make_parents", "是")
-        if make_parents not in {"是", "否"}:
+        if make_parents not in _MAKE_PARENTS_CHOICES:
             raise ValueError("make_parents 必须为 是 或 否")
         cfg["source_path"] = source.strip()
         cfg["destination_path"] = destination.strip()
@@ -1666,22 +1985,22 @@ class FileMoveNode(WorkflowNodeModel):
             raise ExecutionError("源路径未设置")
         if not dest_value:
             raise ExecutionError("目标路径未设置")
-        source = Path(source_value).expanduser()
-        if not source.exists():
+        source_str = os.path.expanduser(source_value)
+        if not os.path.exists(source_str):
             raise ExecutionError("源路径不存在")
-        destination = Path(dest_value).expanduser()
+        source = Path(source_str)
+        destination = Path(os.path.expanduser(dest_value))
         overwrite = cfg.get("overwrite", "覆盖") == "覆盖"
         make_parents = cfg.get("make_parents", "是") == "是"
 
-        final_target = self._determine_target_path(source, destination)
+        final_target = _transfer_target(source, destination)
 
         if final_target.exists():
-            if final_target.resolve() == source.resolve():
-                context.record(self.id, str(final_target.resolve()))
-                return str(final_target.resolve())
-            if not overwrite:
-                context.record(self.id, str(final_target.resolve()))
-                return str(final_target.resolve())
+            # Resolved once: every branch below either reports or compares it.
+            resolved_target = final_target.resolve()
+            if resolved_target == source.resolve() or not overwrite:
+                context.record(self.id, str(resolved_target))
+                return str(resolved_target)
             if final_target.is_dir():
                 shutil.rmtree(final_target)
             else:
@@ -1694,20 +2013,20 @@ class FileMoveNode(WorkflowNodeModel):
             else:
                 raise ExecutionError("目标父目录不存在")
 
-        shutil.move(str(source), str(final_target))
+        try:
+            # final_target is cleared above, so a same-volume move is a single rename.
+            os.replace(source, final_target)
+        except OSError:
+            shutil.move(str(source), str(final_target))
 
-        result = str(final_target.resolve()) if final_target.exists() else str(final_target)
+        result = _resolved_or_plain(final_target)
         context.record(self.id, result)
         return result
 
-    @staticmethod
-    def _determine_target_path(source: Path, destination: Path) -> Path:
-        if destination.exists() and destination.is_dir():
-            return destination / source.name
-        return destination
-
 
 class SwitchContextNode(WorkflowNodeModel):
+    __slots__ = ()
+
     type_name = "switch_context"
     display_name = "切换窗口"
     category = "系统操作"
@@ -1744,6 +2063,7 @@ class SwitchContextNode(WorkflowNodeModel):
             value = cfg.get(key)
             if not isinstance(value, (int, float)) or value < 0:
                 raise ValueError(f"{key} 必须为非负数")
+            cfg[key] = float(value)
         target_window = cfg.get("target_window", {"title": "", "hwnd": 0})
         if isinstance(target_window, str):
             target_window = {"title": target_window.strip(), "hwnd": 0}
@@ -1821,11 +2141,19 @@ class SwitchContextNode(WorkflowNodeModel):
                 hwnd_value = 0
             if not title:
                 raise ExecutionError("目标窗口未设置")
+            # Imported here so loading workflow_core does not bind the Win32 API.
+            from window_utils import activate_window, find_window_by_title, is_window_valid
+
             try:
                 hwnd_int = int(hwnd_value) if hwnd_value else 0
             except (TypeError, ValueError):
                 hwnd_int = 0
             chosen_hwnd = hwnd_int if hwnd_int and is_window_valid(hwnd_int) else 0
+            if chosen_hwnd == 0:
+                # A window found earlier in this run is reused while it still exists.
+                cached_hwnd = context.get_window_cache(title)
+                if cached_hwnd is not None and is_window_valid(cached_hwnd):
+                    chosen_hwnd = cached_hwnd
             if chosen_hwnd == 0:
                 found_hwnd = find_window_by_title(title)
                 if found_hwnd is None:
@@ -1833,6 +2161,7 @@ class SwitchContextNode(WorkflowNodeModel):
                 chosen_hwnd = found_hwnd
             if not activate_window(chosen_hwnd):
                 raise ExecutionError("窗口切换失败")
+            context.set_window_cache(title, chosen_hwnd)
             context.record(self.id, {
                 "mode": mode,
                 "title": title,
@@ -1841,13 +2170,17 @@ class SwitchContextNode(WorkflowNodeModel):
             return
 
         keys, description = self._MODE_CHOICES[mode]
-        repeat = int(cfg.get("repeat", 1))
-        press_interval = float(cfg.get("interval", 0.12))
-        pause = float(cfg.get("pause_between", 0.15))
-        for index in range(repeat):
-            runtime.press_hotkey(list(keys), interval=press_interval)
-            if index < repeat - 1 and pause > 0:
-                time.sleep(pause)
+        repeat = cfg["repeat"]
+        press_interval = cfg["interval"]
+        pause = cfg["pause_between"]
+        key_list = list(keys)
+        press_hotkey = runtime.press_hotkey
+        # Every press but the last is followed by the pause.
+        for _ in range(repeat - 1):
+            press_hotkey(key_list, interval=press_interval)
+            if pause > 0:
+                context.sleep(pause)
+        press_hotkey(key_list, interval=press_interval)
         context.record(self.id, {
             "mode": cfg["mode"],
             "description": description,
@@ -1856,6 +2189,8 @@ class SwitchContextNode(WorkflowNodeModel):
 
 
 class FileDeleteNode(WorkflowNodeModel):
+    __slots__ = ()
+
     type_name = "file_delete"
     display_name = "删除文件/目录"
     category = "系统操作"
@@ -1872,7 +2207,7 @@ class FileDeleteNode(WorkflowNodeModel):
         if not isinstance(target, str):
             raise ValueError("target_path 必须是字符串")
         missing = cfg.get("missing", "忽略")
-        if missing not in {"忽略", "报错"}:
+        if missing not in _MISSING_CHOICES:
             raise ValueError("missing 必须为 忽略 或 报错")
         cfg["target_path"] = target.strip()
         cfg["missing"] = missing
@@ -1899,17 +2234,17 @@ class FileDeleteNode(WorkflowNodeModel):
         target_value = cfg.get("target_path", "")
         if not target_value:
             raise ExecutionError("目标路径未设置")
-        target = Path(target_value).expanduser()
-        if not target.exists():
+        target = os.path.expanduser(target_value)
+        if not os.path.exists(target):
             if cfg.get("missing", "忽略") == "报错":
                 raise ExecutionError("目标不存在")
             context.record(self.id, "not-found")
             return "not-found"
         try:
-            if target.is_dir():
+            if os.path.isdir(target):
                 shutil.rmtree(target)
             else:
-                target.unlink()
+                os.unlink(target)
         except OSError as exc:
             raise ExecutionError(f"删除失败: {exc}") from exc
         context.record(self.id, "deleted")
@@ -1917,6 +2252,8 @@ class FileDeleteNode(WorkflowNodeModel):
 
 
 class CommandNode(WorkflowNodeModel):
+    __slots__ = ()
+
     type_name = "command"
     display_name = "执行命令"
     category = "系统操作"
@@ -1931,26 +2268,19 @@ class CommandNode(WorkflowNodeModel):
 
     def validate_config(self) -> None:
         cfg = self.config
-        command = cfg.get("command")
-        if not isinstance(command, str):
-            raise ValueError("command 必须是字符串")
-        working_dir = cfg.get("working_dir", "")
-        if not isinstance(working_dir, str):
-            raise ValueError("working_dir 必须是字符串")
-        timeout = cfg.get("timeout", 60.0)
+        # Unlike the schema walker, this node has always accepted numeric strings.
         try:
-            timeout_value = float(timeout)
+            cfg["timeout"] = float(cfg.get("timeout", 60.0))
         except (TypeError, ValueError) as exc:
             raise ValueError("timeout 必须为数字") from exc
-        if timeout_value <= 0:
+        self._validate_from_schema()
+        working_dir = cfg.get("working_dir", "")
+        if not isinstance(working_dir, str):
+            raise ValueError("working_dir 必须是字符串")
+        if cfg["timeout"] <= 0:
             raise ValueError("timeout 必须大于 0")
-        on_error = cfg.get("on_error", "报错")
-        if on_error not in {"报错", "忽略"}:
-            raise ValueError("on_error 必须为 报错 或 忽略")
-        cfg["command"] = command.strip()
+        cfg["command"] = cfg["command"].strip()
         cfg["working_dir"] = working_dir.strip()
-        cfg["timeout"] = timeout_value
-        cfg["on_error"] = on_error
 
     def config_schema(self) -> List[Dict[str, Any]]:
         return [
@@ -1983,9 +2313,8 @@ class CommandNode(WorkflowNodeModel):
         if not command:
             raise ExecutionError("命令未设置")
         working_dir = cfg.get("working_dir") or None
-        timeout_value = float(cfg.get("timeout", 60.0))
         try:
-            returncode, stdout, stderr = runtime.run_command(command, timeout_value, working_dir)
+            returncode, stdout, stderr = runtime.run_command(command, cfg["timeout"], working_dir)
         except Exception as exc:  # pragma: no cover - runtime error handling
             raise ExecutionError(f"命令执行异常: {exc}") from exc
         result = {
@@ -2000,6 +2329,8 @@ class CommandNode(WorkflowNodeModel):
 
 
 class PythonCodeNode(WorkflowNodeModel):
+    __slots__ = ()
+
     type_name = "python_code"
     display_name = "执行Python代码"
     category = "系统操作"
@@ -2052,6 +2383,8 @@ class PythonCodeNode(WorkflowNodeModel):
 class ConditionNodeBase(WorkflowNodeModel):
     """Base class for reusable condition evaluation nodes."""
 
+    __slots__ = ()
+
     category = "条件判断"
 
     def input_ports(self) -> List[str]:
@@ -2069,6 +2402,8 @@ class ConditionNodeBase(WorkflowNodeModel):
 
 
 class IfConditionNode(WorkflowNodeModel):
+    __slots__ = ()
+
     type_name = "if_condition"
     display_name = "条件判断"
     category = "流程控制"
@@ -2146,6 +2481,8 @@ class IfConditionNode(WorkflowNodeModel):
 class BinaryExpressionConditionNode(ConditionNodeBase):
     """Condition node that evaluates two expressions and compares them."""
 
+    __slots__ = ()
+
     left_key = "left_expression"
     right_key = "right_expression"
     left_label = "左侧表达式"
@@ -2225,6 +2562,8 @@ class BinaryExpressionConditionNode(ConditionNodeBase):
 class NumericComparisonConditionNode(BinaryExpressionConditionNode):
     """Condition node that compares numeric operands."""
 
+    __slots__ = ()
+
     default_left_expression = "0"
     default_right_expression = "0"
 
@@ -2238,6 +2577,8 @@ class NumericComparisonConditionNode(BinaryExpressionConditionNode):
 
 
 class EqualsConditionNode(BinaryExpressionConditionNode):
+    __slots__ = ()
+
     type_name = "condition_equals"
     display_name = "判断等于"
 
@@ -2246,6 +2587,8 @@ class EqualsConditionNode(BinaryExpressionConditionNode):
 
 
 class NotEqualsConditionNode(BinaryExpressionConditionNode):
+    __slots__ = ()
+
     type_name = "condition_not_equals"
     display_name = "判断不等于"
 
@@ -2254,6 +2597,8 @@ class NotEqualsConditionNode(BinaryExpressionConditionNode):
 
 
 class GreaterThanConditionNode(NumericComparisonConditionNode):
+    __slots__ = ()
+
     type_name = "condition_greater_than"
     display_name = "判断大于"
 
@@ -2262,6 +2607,8 @@ class GreaterThanConditionNode(NumericComparisonConditionNode):
 
 
 class GreaterOrEqualConditionNode(NumericComparisonConditionNode):
+    __slots__ = ()
+
     type_name = "condition_greater_or_equal"
     display_name = "判断大于等于"
 
@@ -2270,6 +2617,8 @@ class GreaterOrEqualConditionNode(NumericComparisonConditionNode):
 
 
 class LessThanConditionNode(NumericComparisonConditionNode):
+    __slots__ = ()
+
     type_name = "condition_less_than"
     display_name = "判断小于"
 
@@ -2278,6 +2627,8 @@ class LessThanConditionNode(NumericComparisonConditionNode):
 
 
 class LessOrEqualConditionNode(NumericComparisonConditionNode):
+    __slots__ = ()
+
     type_name = "condition_less_or_equal"
     display_name = "判断小于等于"
 
@@ -2286,6 +2637,8 @@ class LessOrEqualConditionNode(NumericComparisonConditionNode):
 
 
 class ContainsConditionNode(BinaryExpressionConditionNode):
+    __slots__ = ()
+
     type_name = "condition_contains"
     display_name = "判断包含"
     default_left_expression = "[]"
@@ -2301,6 +2654,8 @@ class ContainsConditionNode(BinaryExpressionConditionNode):
 
 
 class WhileLoopNode(WorkflowNodeModel):
+    __slots__ = ()
+
     type_name = "while_loop"
     display_name = "While 循环"
     category = "控制流"
@@ -2380,6 +2735,8 @@ class WhileLoopNode(WorkflowNodeModel):
 
 
 class ForLoopNode(WorkflowNodeModel):
+    __slots__ = ()
+
     type_name = "for_loop"
     display_name = "For 循环"
     category = "控制流"
@@ -2450,10 +2807,10 @@ class ForLoopNode(WorkflowNodeModel):
 
     def execute(self, context: ExecutionContext, runtime: AutomationRuntime) -> Dict[str, Any]:  # noqa: ARG002
         cfg = self.config
-        start = int(cfg["start"])
-        step = int(cfg["step"])
-        end = int(cfg["end"])
-        max_iterations = int(cfg["max_iterations"])
+        start = cfg["start"]
+        step = cfg["step"]
+        end = cfg["end"]
+        max_iterations = cfg["max_iterations"]
         state = context.get(self.id)
         if not isinstance(state, dict) or state.get("completed"):
             current = start
@@ -2559,21 +2916,33 @@ class IncomingEdge:
 class WorkflowGraph:
     """In-memory representation of a node graph."""
 
+    __slots__ = ("nodes", "edges", "reverse_edges", "_topo_cache", "_zero_indegree")
+
     def __init__(self) -> None:
         self.nodes: Dict[str, WorkflowNodeModel] = {}
-        self.edges: Dict[str, List[OutgoingEdge]] = {}
-        self.reverse_edges: Dict[str, List[IncomingEdge]] = {}
+        # Adjacency as insertion-ordered dicts keyed by the (frozen) edge records,
+        # so iteration order is stable and exact removals are O(1).
+        self.edges: Dict[str, Dict[OutgoingEdge, None]] = {}
+        self.reverse_edges: Dict[str, Dict[IncomingEdge, None]] = {}
+        # Memoized topological_order(); every structural mutator resets it.
+        self._topo_cache: Optional[List[str]] = None
+        # Nodes with no incoming execution edge, kept live so Kahn's pass starts at once.
+        # A dict rather than a set keeps the resulting order deterministic.
+        self._zero_indegree: Dict[str, None] = {}
 
     def add_node(self, node: WorkflowNodeModel) -> None:
         if node.id in self.nodes:
             raise ValueError(f"Node {node.id} already exists")
+        self._topo_cache = None
         self.nodes[node.id] = node
-        self.edges[node.id] = []
-        self.reverse_edges[node.id] = []
+        self.edges[node.id] = {}
+        self.reverse_edges[node.id] = {}
+        self._zero_indegree[node.id] = None
 
     def remove_node(self, node_id: str) -> None:
         if node_id not in self.nodes:
             return
+        self._topo_cache = None
         for incoming in list(self.reverse_edges[node_id]):
             self.remove_edge(
                 incoming.source,
@@ -2591,6 +2960,7 @@ class WorkflowGraph:
         del self.nodes[node_id]
         del self.edges[node_id]
         del self.reverse_edges[node_id]
+        self._zero_indegree.pop(node_id, None)
 
     def add_edge(
         self,
@@ -2599,7 +2969,10 @@ class WorkflowGraph:
         *,
         source_port: int = 0,
         target_port: int = 0,
+        allow_cycle: bool = False,
     ) -> None:
+        """Connect two nodes; ``allow_cycle`` keeps cyclic edges of loaded workflows."""
+
         if source_id == target_id:
             raise ValueError("Cannot connect node to itself")
         if source_id not in self.nodes or target_id not in self.nodes:
@@ -2646,11 +3019,15 @@ class WorkflowGraph:
                 raise ValueError(
                     f"节点 {target_node.title} 的输入端口 '{target_ports[target_port]}' 已连接"
                 )
-        new_edge = OutgoingEdge(target_id, source_port, target_port)
-        self.edges[source_id].append(new_edge)
-        self.reverse_edges[target_id].append(
-            IncomingEdge(source_id, target_port, source_port)
-        )
+        if target_port == 0 and not allow_cycle and self._reachable(target_id, source_id):
+            raise ValueError(
+                f"连接 {source_node.title} -> {target_node.title} 会形成循环，请使用循环节点"
+            )
+        self._topo_cache = None
+        self.edges[source_id][OutgoingEdge(target_id, source_port, target_port)] = None
+        self.reverse_edges[target_id][IncomingEdge(source_id, target_port, source_port)] = None
+        if target_port == 0:
+            self._zero_indegree.pop(target_id, None)
 
     def remove_edge(
         self,
@@ -2660,27 +3037,28 @@ class WorkflowGraph:
         source_port: int | None = None,
         target_port: int | None = None,
     ) -> None:
-        if source_id not in self.edges:
+        outgoing = self.edges.get(source_id)
+        if outgoing is None:
             return
-        removed = False
-        remaining: List[OutgoingEdge] = []
-        for edge in self.edges[source_id]:
-            matches_source = source_port is None or edge.source_port == source_port
-            matches_target = target_port is None or edge.target_port == target_port
-            if edge.target == target_id and matches_source and matches_target:
-                removed = True
+        if source_port is not None and target_port is not None:
+            matched = [OutgoingEdge(target_id, source_port, target_port)]
+        else:
+            matched = [
+                edge
+                for edge in outgoing
+                if edge.target == target_id
+                and (source_port is None or edge.source_port == source_port)
+                and (target_port is None or edge.target_port == target_port)
+            ]
+        incoming = self.reverse_edges.get(target_id)
+        for edge in matched:
+            if outgoing.pop(edge, False) is False:
                 continue
-            remaining.append(edge)
-        self.edges[source_id] = remaining
-        if removed and target_id in self.reverse_edges:
-            filtered: List[IncomingEdge] = []
-            for incoming in self.reverse_edges[target_id]:
-                matches_source = source_port is None or incoming.source_port == source_port
-                matches_target = target_port is None or incoming.target_port == target_port
-                if incoming.source == source_id and matches_source and matches_target:
-                    continue
-                filtered.append(incoming)
-            self.reverse_edges[target_id] = filtered
+            self._topo_cache = None
+            if incoming is not None:
+                incoming.pop(IncomingEdge(source_id, edge.target_port, edge.source_port), None)
+                if edge.target_port == 0 and not any(item.target_port == 0 for item in incoming):
+                    self._zero_indegree[target_id] = None
 
     def entry_nodes(self) -> List[str]:
         entries: List[str] = []
@@ -2692,7 +3070,9 @@ class WorkflowGraph:
                 entries.append(node_id)
         return sorted(entries)
 
-    def validate(self) -> None:
+    def validate(self) -> List[str]:
+        """Check the graph can be executed and return its entry node ids."""
+
         if not self.nodes:
             raise ExecutionError("工作流为空")
         control_nodes = {
@@ -2831,48 +3211,74 @@ class WorkflowGraph:
                     raise ExecutionError(
                         f"{node.title} 只能连接到一个后续节点，如需分支请使用条件节点"
                     )
+        return entries
 
-    def _has_cycle(self) -> bool:
-        try:
-            self.topological_order()
-        except ExecutionError:
-            return True
+    def _reachable(self, start: str, goal: str) -> bool:
+        """Return whether ``goal`` can be reached from ``start`` via execution edges."""
+
+        stack = [start]
+        visited: Set[str] = set()
+        while stack:
+            current = stack.pop()
+            if current == goal:
+                return True
+            if current in visited:
+                continue
+            visited.add(current)
+            for edge in self.edges.get(current, []):
+                if edge.target_port == 0 and edge.target not in visited:
+                    stack.append(edge.target)
         return False
 
+    def has_cycle(self) -> bool:
+        return self._topo_sort_or_none() is None
+
     def topological_order(self) -> List[str]:
+        order = self._topo_sort_or_none()
+        if order is None:
+            raise ExecutionError("Workflow contains cycles")
+        return list(order)
+
+    def _topo_sort_or_none(self) -> Optional[List[str]]:
+        """Return the (cached) execution-edge order, or ``None`` if there is a cycle."""
+
+        if self._topo_cache is not None:
+            return self._topo_cache
+        # Remaining in-degrees are counted lazily, the first time a node is reached.
         indegree: Dict[str, int] = {}
-        for node_id, incoming in self.reverse_edges.items():
-            indegree[node_id] = sum(1 for edge in incoming if edge.target_port == 0)
-        queue = [node for node, degree in indegree.items() if degree == 0]
+        reverse_edges = self.reverse_edges
+        queue = deque(self._zero_indegree)
         order: List[str] = []
-        tmp_indegree = indegree.copy()
         while queue:
-            current = queue.pop(0)
+            current = queue.popleft()
             order.append(current)
             for edge in self.edges.get(current, []):
                 if edge.target_port != 0:
                     continue
                 neighbor = edge.target
-                tmp_indegree[neighbor] -= 1
-                if tmp_indegree[neighbor] == 0:
+                remaining = indegree.get(neighbor)
+                if remaining is None:
+                    remaining = sum(1 for item in reverse_edges[neighbor] if item.target_port == 0)
+                remaining -= 1
+                indegree[neighbor] = remaining
+                if remaining == 0:
                     queue.append(neighbor)
         if len(order) != len(self.nodes):
-            raise ExecutionError("Workflow contains cycles")
+            return None
+        self._topo_cache = order
         return order
 
     def copy(self) -> "WorkflowGraph":
         graph = WorkflowGraph()
         for node in self.nodes.values():
-            node_cls = type(node)
-            graph.add_node(node_cls(node.id, node.title, node.config.copy()))
-        for source, targets in self.edges.items():
-            for edge in targets:
-                graph.edges[source].append(
-                    OutgoingEdge(edge.target, edge.source_port, edge.target_port)
-                )
-                graph.reverse_edges[edge.target].append(
-                    IncomingEdge(source, edge.target_port, edge.source_port)
-                )
+            graph.add_node(node._clone())
+        # Edge records are immutable, so the adjacency dicts can be shallow-copied.
+        graph.edges = {source: targets.copy() for source, targets in self.edges.items()}
+        graph.reverse_edges = {
+            target: sources.copy() for target, sources in self.reverse_edges.items()
+        }
+        graph._topo_cache = self._topo_cache
+        graph._zero_indegree = self._zero_indegree.copy()
         return graph
 
     def build_loop_back_map(self) -> Dict[str, str]:
@@ -2896,9 +3302,9 @@ class WorkflowGraph:
                 continue
             # BFS 收集循环体
             body_nodes: Set[str] = set()
-            queue = [body_entry]
+            queue = deque([body_entry])
             while queue:
-                current = queue.pop(0)
+                current = queue.popleft()
                 if current in body_nodes:
                     continue
                 body_nodes.add(current)
@@ -2964,12 +3370,23 @@ class WorkflowExecutor:
         graph: WorkflowGraph,
         *,
         should_stop: Callable[[], bool] | None = None,
+        stop_event: threading.Event | None = None,
     ) -> ExecutionContext:
-        graph.validate()
-        loop_back_map = graph.build_loop_back_map()
-        context = ExecutionContext()
+        """Run ``graph`` to completion.
+
+        Cancellation is checked between nodes via ``should_stop``; a
+        ``stop_event`` additionally interrupts waits inside delay and polling
+        nodes, and implies ``should_stop`` when that is not given.
+        """
+
+        if stop_event is not None and should_stop is None:
+            should_stop = stop_event.is_set
+        entries = graph.validate()
+        # A lone node cannot close a loop, so skip building the loop-back map.
+        loop_back_map = graph.build_loop_back_map() if len(graph.nodes) > 1 else {}
+        context = ExecutionContext(stop_event=stop_event)
         executed_steps = 0
-        for start_id in graph.entry_nodes():
+        for start_id in entries:
             executed_steps = self._run_from(
                 start_id,
                 graph,
@@ -2989,22 +3406,28 @@ class WorkflowExecutor:
         executed_steps: int,
         loop_back_map: Dict[str, str],
     ) -> int:
+        # Execution follows a single control path (one entry, one successor per
+        # step), so nodes run strictly in order; hoist per-step lookups instead.
+        nodes = graph.nodes
+        runtime = self.runtime
+        max_steps = self.max_steps
+        loop_controller_for = loop_back_map.get
         current = start_id
         while current is not None:
             if should_stop is not None and should_stop():
                 raise ExecutionError("Execution cancelled")
-            node = graph.nodes.get(current)
+            node = nodes.get(current)
             if node is None:
                 raise ExecutionError(f"节点 {current} 不存在")
             executed_steps += 1
-            if executed_steps > self.max_steps:
+            if executed_steps > max_steps:
                 raise ExecutionError("执行步数超过上限，可能存在无限循环")
             try:
-                node.execute(context, self.runtime)
+                node.execute(context, runtime)
             except Exception as exc:  # pragma: no cover - GUI handles error display
                 raise ExecutionError(f"Node {node.title} failed: {exc}") from exc
             next_id = node.determine_next(graph, context)
-            loop_controller = loop_back_map.get(current)
+            loop_controller = loop_controller_for(current)
             if loop_controller is not None:
                 next_id = loop_controller
             current = next_id
@@ -3018,6 +3441,7 @@ def create_node(node_type: str, node_id: str, title: Optional[str] = None) -> Wo
     return node_cls(node_id, title)
 
 
-def iter_registry() -> Iterable[WorkflowNodeModel]:
-    for cls in NODE_REGISTRY.values():
-        yield cls("__preview__")
+def iter_registry() -> Iterable[Type[WorkflowNodeModel]]:
+    """Yield registered node classes; their metadata lives on class attributes."""
+
+    yield from NODE_REGISTRY.values()